@@ -1,4 +1,3 @@
-import json
 import os
 from PyQt5.QtWidgets import (
     QWidget, QPushButton, QVBoxLayout, QTextEdit, QFileDialog, QMessageBox,
@@ -8,6 +7,8 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon, QPalette, QColor, QFont
 
 from model.automate import Automate
+from model.cache import CacheAutomates
+from Window.OperationWorker import OperationArrierePlan
 
 class StyleSheet:
     BUTTON_STYLE = """
@@ -45,6 +46,10 @@ class AnalyseAutomateWindow(QWidget):
         super().__init__()
         self.setWindowTitle("Analyse des Automates")
         self.automate = None
+        # Résultats de determiniser / minimiser / completer conservés sur disque
+        self.cache = CacheAutomates()
+        # Les opérations longues tournent hors du thread de l'interface et sont annulables
+        self.operations = OperationArrierePlan(self)
         self.init_ui()
         self.adjust_window_size()
 
@@ -131,6 +136,7 @@ class AnalyseAutomateWindow(QWidget):
         btn_revenir = self.create_button("Retourner à l'accueil", "🏠")
         btn_revenir.clicked.connect(self.revenir_accueil)
         scroll_layout.addWidget(btn_revenir)
+        self.operations.bloquer_pendant(file_group, analyse_group, transform_group, btn_revenir)
 
         # Add stretch to push everything up
         scroll_layout.addStretch()
@@ -210,7 +216,17 @@ class AnalyseAutomateWindow(QWidget):
         if not self.automate.est_deterministe():
             QMessageBox.warning(self, "Erreur", "L'automate doit être déterministe pour vérifier la minimalité.")
             return
-        if self.automate.est_minimal():
+        # Même critère que Automate.est_minimal, mais avec la version minimisée du cache
+        automate = self.automate
+        self.operations.lancer(
+            "Vérification de la minimalité", "séparateurs traités",
+            lambda progression: len(self.cache.calculer(automate, "minimiser", progression).etats) == len(automate.etats),
+            self.afficher_minimalite,
+            lambda message: QMessageBox.warning(self, "Erreur", f"Erreur lors de la vérification : {message}")
+        )
+
+    def afficher_minimalite(self, est_minimal):
+        if est_minimal:
             QMessageBox.information(self, "Minimalité", "✅ L'automate est minimal.")
         else:
             QMessageBox.information(self, "Minimalité", "❌ L'automate n'est PAS minimal.")
@@ -222,8 +238,17 @@ class AnalyseAutomateWindow(QWidget):
         if not self.automate.est_deterministe():
             QMessageBox.warning(self, "Erreur", "L'automate doit être déterministe pour être minimisé.")
             return
+        automate = self.automate
+        self.operations.lancer(
+            "Minimisation", "séparateurs traités",
+            lambda progression: self.cache.calculer(automate, "minimiser", progression),
+            self.afficher_minimise,
+            lambda message: QMessageBox.warning(self, "Erreur", f"Erreur lors de la minimisation : {message}")
+        )
+
+    def afficher_minimise(self, automate_min):
         try:
-            self.automate = self.automate.minimiser()
+            self.automate = automate_min
             self.result.setText(str(self.automate))
             QMessageBox.information(self, "Succès", "✅ Automate minimisé avec succès.")
 
@@ -239,11 +264,10 @@ class AnalyseAutomateWindow(QWidget):
                     self,
                     "Sauvegarder l'automate minimisé",
                     "",
-                    "Fichiers JSON (*.json);;Tous les fichiers (*)"
+                    "Fichiers JSON (*.json);;Automates binaires (*.autb);;Tous les fichiers (*)"
                 )
                 if chemin:
-                    with open(chemin, "w", encoding="utf-8") as f:
-                        json.dump(self.automate.to_dict(), f, indent=4, ensure_ascii=False)
+                    self.automate.sauvegarder(chemin)
                     QMessageBox.information(self, "Succès", f"✅ Automate minimisé sauvegardé sous :\n{chemin}")
 
         except Exception as e:
@@ -254,8 +278,17 @@ class AnalyseAutomateWindow(QWidget):
             QMessageBox.warning(self, "Erreur", "Veuillez charger un automate d'abord.")
             return
 
+        automate = self.automate
+        self.operations.lancer(
+            "Complétion", "états traités",
+            lambda progression: self.cache.calculer(automate, "completer", progression),
+            self.afficher_complete,
+            lambda message: QMessageBox.critical(self, "Erreur", f"❌ Erreur lors de la complétion : {message}")
+        )
+
+    def afficher_complete(self, automate_complet):
         try:
-            self.automate = self.automate.completer()
+            self.automate = automate_complet
             self.result.setText(str(self.automate))
             QMessageBox.information(self, "Succès", "✅ L'automate a été complété avec succès.")
 
@@ -266,18 +299,16 @@ class AnalyseAutomateWindow(QWidget):
                 dossier = QFileDialog.getExistingDirectory(self, "Choisir un dossier de sauvegarde")
                 if dossier:
                     chemin = os.path.join(dossier, self.automate.nom + "_complet.json")
-                    with open(chemin, "w", encoding="utf-8") as f:
-                        json.dump(self.automate.to_dict(), f, indent=4, ensure_ascii=False)
+                    self.automate.sauvegarder(chemin)
                     QMessageBox.information(self, "Succès", f"✅ Automate complété sauvegardé sous :\n{chemin}")
 
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"❌ Erreur lors de la complétion : {str(e)}")
 
     def charger_automate(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Choisir un automate", "", "Fichiers JSON (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, "Choisir un automate", "", "Automates (*.json *.autb)")
         if path:
-            with open(path, "r", encoding="utf-8") as f:
-                self.automate = Automate.from_dict(json.load(f))
+            self.automate = Automate.charger(path)
             self.result.setText(str(self.automate))
 
     def verifier_determinisme(self):
@@ -294,12 +325,15 @@ class AnalyseAutomateWindow(QWidget):
             QMessageBox.warning(self, "Erreur", "Veuillez charger un automate d'abord.")
             return
 
-        try:
-            afd = self.automate.determiniser()
-        except Exception as e:
-            QMessageBox.critical(self, "Erreur", f"Erreur lors de la déterminisation : {str(e)}")
-            return
+        automate = self.automate
+        self.operations.lancer(
+            "Déterminisation", "sous-ensembles explorés",
+            lambda progression: self.cache.calculer(automate, "determiniser", progression),
+            self.afficher_afd,
+            lambda message: QMessageBox.critical(self, "Erreur", f"Erreur lors de la déterminisation : {message}")
+        )
 
+    def afficher_afd(self, afd):
         # Afficher la représentation de l'AFD (attention à la méthode __str__ de Automate)
         self.result.setText(str(afd))
 
@@ -310,13 +344,13 @@ class AnalyseAutomateWindow(QWidget):
             "Voulez-vous sauvegarder l'AFD ?",
             QMessageBox.Yes | QMessageBox.No
         )
+        dossier = None
         if sauvegarder == QMessageBox.Yes:
             dossier = QFileDialog.getExistingDirectory(self, "Choisir un dossier de sauvegarde")
         if dossier:
             chemin = os.path.join(dossier, afd.nom + ".json")
             try:
-                with open(chemin, "w", encoding="utf-8") as f:
-                    json.dump(afd.to_dict(), f, indent=4, ensure_ascii=False)
+                afd.sauvegarder(chemin)
                 QMessageBox.information(self, "Succès", f"AFD sauvegardé sous {chemin}")
             except Exception as e:
                 QMessageBox.critical(self, "Erreur", f"Impossible de sauvegarder le fichier : {str(e)}")
@@ -1,18 +1,22 @@
-import json
 import os
 import shutil
 
 from PyQt5.QtWidgets import (
     QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QTextEdit, QFileDialog, QMessageBox, QCheckBox,
-    QFrame, QScrollArea, QGroupBox, QGridLayout, QDesktopWidget
+    QFrame, QGroupBox, QGridLayout, QDesktopWidget, QComboBox,
+    QTableWidget, QTableWidgetItem, QAbstractItemView, QHeaderView
 )
 from PyQt5.QtCore import Qt, QPropertyAnimation, QRect
-from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap
+from PyQt5.QtGui import QFont, QColor, QIcon
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect
 
 from interfaceGraphique.AcceuilWindow import AccueilWindow
 from model.automate import Automate
+from model.cache import CacheAutomates
+from model.catalogue import Catalogue
+from Window.OperationWorker import OperationArrierePlan
+from Window.VueAutomate import VueAutomate
 
 class ModernGroupBox(QGroupBox):
     def __init__(self, title, parent=None):
@@ -84,11 +88,24 @@ class ModernButton(QPushButton):
         self.setCursor(Qt.PointingHandCursor)
 
 class AutomateApp(QWidget):
+    LIMITE_RESULTATS = 500
+    FILTRES = {
+        "Tous": {},
+        "Déterministes": {"deterministe": True},
+        "Non déterministes": {"deterministe": False},
+        "Complets": {"complet": True},
+        "Minimaux": {"minimal": True},
+    }
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Gestion des Automates")
         self.automate = None
         self.base_path = ""
+        # Index des automates du dossier de travail : recherche sans relire chaque fichier
+        self.catalogue = None
+        self.entrees_catalogue = []
+        self.operations = OperationArrierePlan(self)
         self.init_ui()
         self.adjust_window_size()
         
@@ -266,6 +283,51 @@ class AutomateApp(QWidget):
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
         
+        # Bibliothèque des automates du dossier de travail
+        biblio_container = QWidget()
+        biblio_layout = QVBoxLayout(biblio_container)
+
+        biblio_title = QLabel("Bibliothèque")
+        biblio_title.setStyleSheet("""
+            QLabel {
+                color: #1e293b;
+                font-size: 16px;
+                font-weight: bold;
+                padding: 10px 0;
+            }
+        """)
+        biblio_layout.addWidget(biblio_title)
+
+        filtres_layout = QHBoxLayout()
+        self.recherche = ModernLineEdit(placeholder="Rechercher un automate par nom")
+        self.recherche.textChanged.connect(self.rechercher_automates)
+        filtres_layout.addWidget(self.recherche, 3)
+        self.filtre = QComboBox()
+        self.filtre.addItems(self.FILTRES.keys())
+        self.filtre.currentIndexChanged.connect(self.changer_filtre)
+        filtres_layout.addWidget(self.filtre, 1)
+        btn_actualiser = ModernButton("🔄 Actualiser", False)
+        btn_actualiser.clicked.connect(self.actualiser_catalogue)
+        filtres_layout.addWidget(btn_actualiser)
+        # Changer de dossier pendant une mise à jour laisserait le nouveau catalogue sans relecture
+        self.operations.bloquer_pendant(btn_dossier, btn_actualiser)
+        biblio_layout.addLayout(filtres_layout)
+
+        self.table_catalogue = QTableWidget(0, 5)
+        self.table_catalogue.setHorizontalHeaderLabels(["Nom", "États", "Transitions", "Alphabet", "Propriétés"])
+        self.table_catalogue.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_catalogue.verticalHeader().setVisible(False)
+        self.table_catalogue.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_catalogue.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_catalogue.setMaximumHeight(200)
+        self.table_catalogue.cellDoubleClicked.connect(self.ouvrir_depuis_catalogue)
+        biblio_layout.addWidget(self.table_catalogue)
+
+        self.info_catalogue = QLabel("Choisissez un dossier pour afficher ses automates.")
+        biblio_layout.addWidget(self.info_catalogue)
+
+        right_layout.addWidget(biblio_container)
+
         # Créer un widget pour contenir la visualisation
         viz_container = QWidget()
         viz_layout = QVBoxLayout(viz_container)
@@ -282,21 +344,16 @@ class AutomateApp(QWidget):
         """)
         viz_layout.addWidget(viz_title)
 
-        # Scroll area pour la visualisation
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("""
-            QScrollArea {
+        # Vue interactive (zoom à la molette, déplacement au glisser)
+        self.vue = VueAutomate()
+        self.vue.setStyleSheet("""
+            QGraphicsView {
                 border: none;
-                background: transparent;
+                background: white;
+                border-radius: 10px;
             }
         """)
-
-        # Label pour l'image
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        scroll.setWidget(self.image_label)
-        viz_layout.addWidget(scroll)
+        viz_layout.addWidget(self.vue)
 
         # Description textuelle
         self.result = QTextEdit()
@@ -331,6 +388,116 @@ class AutomateApp(QWidget):
         self.base_path = QFileDialog.getExistingDirectory(self, "Choisir un dossier")
         if self.base_path:
             QMessageBox.information(self, "Succès", f"Dossier sélectionné : {self.base_path}")
+            self.ouvrir_catalogue()
+
+    def ouvrir_catalogue(self):
+        if self.catalogue is not None:
+            self.catalogue.fermer()
+            self.catalogue = None
+        try:
+            self.catalogue = Catalogue(self.base_path)
+        except Exception as e:
+            # Dossier en lecture seule par exemple : la bibliothèque reste simplement vide
+            self.info_catalogue.setText(f"Bibliothèque indisponible : {str(e)}")
+            return
+        self.rechercher_automates()
+        self.actualiser_catalogue()
+
+    def actualiser_catalogue(self):
+        """Relit en arrière-plan les fichiers ajoutés ou modifiés depuis la dernière visite"""
+        if self.catalogue is None:
+            QMessageBox.warning(self, "Erreur", "Veuillez d'abord sélectionner un dossier.")
+            return
+        dossier = self.base_path
+
+        def synchroniser(progression):
+            # Connexion propre au thread de travail : une connexion SQLite reste dans son thread
+            catalogue = Catalogue(dossier)
+            try:
+                return catalogue.mettre_a_jour(progression)
+            finally:
+                catalogue.fermer()
+
+        self.operations.lancer(
+            "Mise à jour de la bibliothèque", "fichiers examinés", synchroniser,
+            lambda resultat: self.changer_filtre(),
+            lambda message: self.info_catalogue.setText(f"Erreur lors de la mise à jour : {message}")
+        )
+
+    def changer_filtre(self):
+        self.rechercher_automates()
+        if "minimal" in self.FILTRES[self.filtre.currentText()]:
+            self.calculer_minimalite()
+
+    def calculer_minimalite(self):
+        """Minimise en arrière-plan les grands automates dont la relecture a laissé la minimalité inconnue"""
+        if self.catalogue is None or not self.catalogue.minimalites_inconnues():
+            return
+        dossier = self.base_path
+
+        def calculer(progression):
+            catalogue = Catalogue(dossier)
+            try:
+                return catalogue.calculer_minimalite(progression, CacheAutomates())
+            finally:
+                catalogue.fermer()
+
+        self.operations.lancer(
+            "Vérification de la minimalité", "automates vérifiés", calculer,
+            lambda resultat: self.rechercher_automates(),
+            lambda message: self.info_catalogue.setText(f"Erreur lors de la vérification : {message}")
+        )
+
+    def rechercher_automates(self):
+        if self.catalogue is None:
+            return
+        entrees = self.catalogue.rechercher(
+            self.recherche.text().strip(), limite=self.LIMITE_RESULTATS + 1,
+            **self.FILTRES[self.filtre.currentText()]
+        )
+        self.entrees_catalogue = entrees[:self.LIMITE_RESULTATS]
+        self.table_catalogue.setRowCount(len(self.entrees_catalogue))
+        for ligne, entree in enumerate(self.entrees_catalogue):
+            if entree["erreur"]:
+                proprietes = "⚠️ illisible"
+            else:
+                proprietes = ", ".join(
+                    libelle for colonne, libelle in
+                    (("deterministe", "déterministe"), ("complet", "complet"), ("minimal", "minimal"))
+                    if entree[colonne]
+                )
+                if entree["deterministe"] and entree["minimal"] is None:
+                    proprietes += ", minimalité non vérifiée"
+            valeurs = [entree["nom"], entree["nb_etats"], entree["nb_transitions"],
+                       " ".join(entree["alphabet"]), proprietes]
+            for colonne, valeur in enumerate(valeurs):
+                item = QTableWidgetItem("" if valeur is None else str(valeur))
+                item.setToolTip(entree["erreur"] or entree["chemin"])
+                self.table_catalogue.setItem(ligne, colonne, item)
+        if len(entrees) > self.LIMITE_RESULTATS:
+            self.info_catalogue.setText(f"Plus de {self.LIMITE_RESULTATS} automates : affinez la recherche.")
+        else:
+            self.info_catalogue.setText(f"{len(entrees)} automate(s) sur {self.catalogue.compter()}. "
+                                        "Double-cliquez pour ouvrir.")
+
+    def ouvrir_depuis_catalogue(self, ligne, colonne=0):
+        entree = self.entrees_catalogue[ligne]
+        try:
+            self.automate = Automate.charger(self.catalogue.chemin_absolu(entree))
+            self.nom_automate.setText(self.automate.nom)
+            self.afficher_automate()
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement de l'automate : {str(e)}")
+
+    def _indexer(self, chemin):
+        """Tient le catalogue à jour après une sauvegarde ; il n'est qu'un index, une erreur est ignorée"""
+        if self.catalogue is None:
+            return
+        try:
+            self.catalogue.indexer(chemin, self.automate)
+            self.rechercher_automates()
+        except Exception:
+            pass
 
     def creer_automate(self):
         nom = self.nom_automate.text()
@@ -350,12 +517,14 @@ class AutomateApp(QWidget):
             QMessageBox.warning(self, "Erreur", "Veuillez d'abord sélectionner un dossier.")
             return
         try:
-            chemin = os.path.join(self.base_path, self.nom_automate.text(), f"{self.nom_automate.text()}.json")
-            if not os.path.exists(chemin):
+            nom = self.nom_automate.text()
+            # Le JSON reste le format de l'espace de travail ; le binaire est accepté à défaut
+            chemins = [os.path.join(self.base_path, nom, nom + ext) for ext in (".json", ".autb")]
+            chemin = next((c for c in chemins if os.path.exists(c)), None)
+            if chemin is None:
                 QMessageBox.warning(self, "Erreur", "Fichier automate introuvable.")
                 return
-            with open(chemin, "r", encoding="utf-8") as f:
-                self.automate = Automate.from_dict(json.load(f))
+            self.automate = Automate.charger(chemin)
             self.afficher_automate()
             QMessageBox.information(self, "Succès", f"L'automate '{self.automate.nom}' a été chargé avec succès.")
         except Exception as e:
@@ -441,8 +610,8 @@ class AutomateApp(QWidget):
             return
         try:
             path = os.path.join(self.base_path, self.automate.nom, f"{self.automate.nom}.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self.automate.to_dict(), f, indent=4, ensure_ascii=False)
+            self.automate.sauvegarder(path)
+            self._indexer(path)
             QMessageBox.information(self, "Succès", f"L'automate a été sauvegardé dans :\n{path}")
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la sauvegarde : {str(e)}")
@@ -459,9 +628,12 @@ class AutomateApp(QWidget):
                 path = os.path.join(self.base_path, self.automate.nom)
                 if os.path.exists(path):
                     shutil.rmtree(path)
+                    if self.catalogue is not None:
+                        self.catalogue.retirer(path)
+                        self.rechercher_automates()
                     self.automate = None
                     self.result.clear()
-                    self.image_label.clear()
+                    self.vue.effacer()
                     QMessageBox.information(self, "Succès", "L'automate a été supprimé avec succès.")
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la suppression : {str(e)}")
@@ -488,52 +660,8 @@ class AutomateApp(QWidget):
             """)
             self.result.setText(str(self.automate))
 
-            # Générer et afficher la visualisation
-            try:
-                image_path = self.automate.visualiser()
-                if image_path and os.path.exists(image_path):
-                    pixmap = QPixmap(image_path)
-                    # Redimensionner l'image si elle est trop grande
-                    if pixmap.width() > 800:
-                        pixmap = pixmap.scaledToWidth(800, Qt.SmoothTransformation)
-                    self.image_label.setPixmap(pixmap)
-                    self.image_label.setStyleSheet("""
-                        QLabel {
-                            background-color: white;
-                            border-radius: 10px;
-                            padding: 10px;
-                        }
-                    """)
-                else:
-                    self.image_label.setText(
-                        "Visualisation non disponible.\n\n"
-                        "Pour activer la visualisation graphique, veuillez :\n"
-                        "1. Installer Graphviz depuis https://graphviz.org/download/\n"
-                        "2. Ajouter le dossier bin de Graphviz au PATH système\n"
-                        "3. Redémarrer l'application"
-                    )
-                    self.image_label.setStyleSheet("""
-                        QLabel {
-                            background-color: #fff5f5;
-                            color: #e53e3e;
-                            border: 2px solid #fed7d7;
-                            border-radius: 10px;
-                            padding: 20px;
-                            font-size: 13px;
-                        }
-                    """)
-            except Exception as e:
-                self.image_label.setText(f"Erreur de visualisation :\n{str(e)}")
-                self.image_label.setStyleSheet("""
-                    QLabel {
-                        background-color: #fff5f5;
-                        color: #e53e3e;
-                        border: 2px solid #fed7d7;
-                        border-radius: 10px;
-                        padding: 20px;
-                        font-size: 13px;
-                    }
-                """)
+            # Disposition en cache affichée tout de suite, Graphviz affine en arrière-plan
+            self.vue.afficher(self.automate)
         else:
             self.result.clear()
-            self.image_label.clear()
+            self.vue.effacer()
@@ -1,15 +1,16 @@
-import json
 from PyQt5.QtCore import Qt, QSize, QTimer
-from PyQt5.QtGui import QPixmap, QFont, QColor, QIcon
+from PyQt5.QtGui import QFont, QColor, QIcon
 from PyQt5.QtWidgets import (
     QWidget, QPushButton, QVBoxLayout, QLabel,
     QLineEdit, QTextEdit, QFileDialog, QInputDialog,
     QHBoxLayout, QFrame, QScrollArea, QSizePolicy,
     QGraphicsDropShadowEffect, QGroupBox, QGridLayout,
-    QDesktopWidget
+    QDesktopWidget, QCheckBox
 )
 
 from model.automate import Automate
+from Window.OperationWorker import OperationArrierePlan
+from Window.VueAutomate import VueAutomate
 
 class ModernGroupBox(QGroupBox):
     def __init__(self, title, parent=None):
@@ -100,12 +101,15 @@ class ScrollableTextEdit(QTextEdit):
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
 class MotEtLangages(QWidget):
+    LIMITE_MOTS_AFFICHES = 1000
+
     def __init__(self, automate, autres_automates: dict):
         super().__init__()
         self.automate = automate
         self.autre_automate = None
         self.autres_automates = autres_automates
         self.etat_initial = self.get_initial_state(self.automate.to_dict()) if self.automate else None
+        self.operations = OperationArrierePlan(self)
         
         self.init_ui()
         self.adjust_size()
@@ -164,8 +168,12 @@ class MotEtLangages(QWidget):
         word_group = ModernGroupBox("Reconnaissance de Mots")
         word_layout = QVBoxLayout(word_group)
         
-        self.input_mot = ModernLineEdit("Entrez un mot à tester")
+        self.input_mot = ModernLineEdit("Entrez un mot")
         word_layout.addWidget(self.input_mot)
+
+        # Le champ contient un seul mot, espaces compris, sauf si le test en lot est demandé
+        self.check_lot = QCheckBox("Tester plusieurs mots séparés par des espaces")
+        word_layout.addWidget(self.check_lot)
         
         btn_tester = ModernButton("Tester le mot", True, "🔍")
         btn_tester.clicked.connect(self.tester_mot)
@@ -216,6 +224,7 @@ class MotEtLangages(QWidget):
         btn_revenir = ModernButton("Retour à l'accueil", False, "🏠")
         btn_revenir.clicked.connect(self.revenir_accueil)
         left_layout.addWidget(btn_revenir)
+        self.operations.bloquer_pendant(loading_group, word_group, gen_group, op_group, btn_revenir)
 
         # Add left panel to main layout with shadow
         left_container = QWidget()
@@ -253,19 +262,18 @@ class MotEtLangages(QWidget):
         """)
         right_layout.addWidget(viz_title)
 
-        # Image Display
-        self.label_image = QLabel()
-        self.label_image.setAlignment(Qt.AlignCenter)
-        self.label_image.setMinimumSize(500, 300)
-        self.label_image.setStyleSheet("""
-            QLabel {
+        # Vue interactive de l'automate
+        self.vue = VueAutomate()
+        self.vue.setMinimumSize(500, 300)
+        self.vue.setStyleSheet("""
+            QGraphicsView {
                 background-color: white;
                 border: 2px solid #e2e8f0;
                 border-radius: 10px;
                 padding: 10px;
             }
         """)
-        right_layout.addWidget(self.label_image, 2)
+        right_layout.addWidget(self.vue, 2)
 
         # Results Title
         results_title = QLabel("Résultats")
@@ -321,25 +329,7 @@ class MotEtLangages(QWidget):
             self.afficher_automate(self.automate)
 
     def afficher_automate(self, automate):
-        try:
-            # Générer l'image de l'automate
-            automate.to_graphviz("temp_automate")
-            pixmap = QPixmap("temp_automate.png")
-            if not pixmap.isNull():
-                # Redimensionner l'image si elle est trop grande tout en gardant le ratio
-                label_size = self.label_image.size()
-                scaled_pixmap = pixmap.scaled(
-                    label_size,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.label_image.setPixmap(scaled_pixmap)
-            else:
-                self.label_image.setText("Visualisation non disponible")
-                print("Erreur: Impossible de charger l'image générée")
-        except Exception as e:
-            self.label_image.setText(f"Erreur de visualisation : {str(e)}")
-            print(f"Erreur lors de la visualisation : {str(e)}")  # Pour le débogage
+        self.vue.afficher(automate)
 
     def get_initial_state(self, data):
         for etat in data["etats"]:
@@ -348,77 +338,131 @@ class MotEtLangages(QWidget):
         return None
 
     def charger_automate_principal(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Choisir un automate principal", "", "Fichiers JSON (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, "Choisir un automate principal", "", "Automates (*.json *.autb)")
         if path:
-            with open(path, "r", encoding="utf-8") as f:
-                jsonData = json.load(f)
-                self.etat_initial = self.get_initial_state(jsonData)
-                self.automate = Automate.from_dict(jsonData)
+            self.automate = Automate.charger(path)
+            self.etat_initial = self.automate.get_etat_initial()
             self.resultat.setText(f"✅ Automate principal chargé : {self.automate.nom}")
 
     def charger_automate_secondaire(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Choisir un autre automate", "", "Fichiers JSON (*.json)")
+        path, _ = QFileDialog.getOpenFileName(self, "Choisir un autre automate", "", "Automates (*.json *.autb)")
         if path:
-            with open(path, "r", encoding="utf-8") as f:
-                jsonData = json.load(f)
-                self.autre_automate = Automate.from_dict(jsonData)
-                nom, ok = QInputDialog.getText(self, "Nom de l'automate", "Entrez un nom pour cet automate :")
-                if ok and nom:
-                    self.autres_automates[nom] = self.autre_automate
-                    self.resultat.setText(f"✅ Automate secondaire « {nom} » chargé avec succès.")
-                else:
-                    self.resultat.setText("❌ Nom invalide. L'automate n'a pas été ajouté.")
+            self.autre_automate = Automate.charger(path)
+            nom, ok = QInputDialog.getText(self, "Nom de l'automate", "Entrez un nom pour cet automate :")
+            if ok and nom:
+                self.autres_automates[nom] = self.autre_automate
+                self.resultat.setText(f"✅ Automate secondaire « {nom} » chargé avec succès.")
+            else:
+                self.resultat.setText("❌ Nom invalide. L'automate n'a pas été ajouté.")
 
     def reconnait(self, mot: str) -> bool:
+        if not self.automate.est_deterministe():
+            # AFN ou ε-AFN : simulation sur les ensembles d'états
+            return self.automate.reconnait(mot)
         etat_courant = self.etat_initial
         for symbole in mot:
             if symbole not in self.automate.alphabet:
                 return False
-            transition_trouvee = False
-            for t in self.automate.transitions:
-                if t.source == etat_courant and t.symbole == symbole:
-                    etat_courant = t.destination
-                    transition_trouvee = True
-                    break
-            if not transition_trouvee:
+            etat_courant = self.automate.transition(etat_courant, symbole)
+            if etat_courant is None:
                 return False
-        return etat_courant in [e.nom for e in self.automate.etats.values() if e.est_final]
+        return self.automate.est_final(etat_courant)
 
     def tester_mot(self):
         mot = self.input_mot.text()
         if mot == "":
             self.resultat.setText("❌ Veuillez entrer un mot.")
             return
+        if self.check_lot.isChecked():
+            # Plusieurs mots séparés par des espaces : test en lot sur l'automate compilé
+            mots = mot.split()
+            if not mots:
+                self.resultat.setText("❌ Veuillez entrer au moins un mot.")
+                return
+            try:
+                reconnus = self.automate.reconnait_lot(mots)
+            except Exception as e:
+                self.resultat.setText(f"❌ Erreur lors du test des mots : {str(e)}")
+                return
+            lignes = [f"✅ « {m} » reconnu" if r else f"❌ « {m} » rejeté" for m, r in zip(mots, reconnus)]
+            self.resultat.setText(f"{sum(map(bool, reconnus))}/{len(mots)} mots reconnus :\n" + "\n".join(lignes))
+            return
         reconnu = self.reconnait(mot)
         self.resultat.setText(f"✅ Le mot « {mot} » est reconnu." if reconnu else f"❌ Le mot « {mot} » est rejeté.")
 
     def generer_mots_acceptes(self):
         try:
             n = int(self.input_longueur.text())
-            mots = self.automate.generer_mots_acceptes(n)
-            self.resultat.setText("Mots acceptés :\n" + ", ".join(mots))
-        except Exception:
+        except ValueError:
             self.resultat.setText("❌ Entrez une longueur maximale valide.")
+            return
+        automate = self.automate
+        self.operations.lancer(
+            "Génération des mots acceptés", "mots générés",
+            lambda progression: self.calculer_mots_acceptes(automate, n, progression),
+            lambda resultat: self.afficher_mots_acceptes(n, *resultat),
+            lambda message: self.resultat.setText(f"❌ Erreur lors de la génération : {message}")
+        )
+
+    @classmethod
+    def calculer_mots_acceptes(cls, automate, n, progression=None):
+        """
+        Travail de generer_mots_acceptes, exécuté hors du thread de l'interface : retourne
+        les LIMITE_MOTS_AFFICHES + 1 premiers mots de longueur <= n et le nombre total de mots.
+        """
+        # On ne matérialise que les premiers mots : le langage peut être très grand
+        mots = list(automate.iter_mots_acceptes(n, limit=cls.LIMITE_MOTS_AFFICHES + 1, progression=progression))
+        if len(mots) <= cls.LIMITE_MOTS_AFFICHES:
+            return mots, len(mots)  # liste complète : le dénombrement est inutile
+        return mots, automate.compter_mots_jusqua(n, progression)
+
+    def afficher_mots_acceptes(self, n, mots, total):
+        texte = f"Mots acceptés ({total} de longueur ≤ {n}) :\n" + ", ".join(mots[:self.LIMITE_MOTS_AFFICHES])
+        if len(mots) > self.LIMITE_MOTS_AFFICHES:
+            texte += f"\n… (affichage limité aux {self.LIMITE_MOTS_AFFICHES} premiers mots)"
+        self.resultat.setText(texte)
 
     def mots_rejetes(self):
         try:
             n = int(self.input_longueur.text())
-            mots = self.automate.mots_rejetes(n)
-            self.resultat.setText("Mots rejetés :\n" + ", ".join(mots))
-        except Exception:
+        except ValueError:
             self.resultat.setText("❌ Entrez une longueur maximale valide.")
+            return
+        automate = self.automate
+        self.operations.lancer(
+            "Recherche des mots rejetés", "mots énumérés",
+            lambda progression: automate.mots_rejetes(n, progression),
+            lambda mots: self.resultat.setText("Mots rejetés :\n" + ", ".join(mots)),
+            lambda message: self.resultat.setText(f"❌ Erreur lors de la recherche : {message}")
+        )
 
     def tester_equivalence(self):
         if not self.autre_automate:
             self.resultat.setText("❌ Aucun automate secondaire chargé.")
             return
         try:
-            n = int(self.input_longueur.text())
-            equiv = self.automate.est_equivalent(self.autre_automate, n)
-            msg = "✅ Les deux automates sont équivalents." if equiv else "❌ Les deux automates ne sont pas équivalents."
-            self.resultat.setText(msg)
-        except Exception:
+            # La longueur maximale est optionnelle : sans elle, le test est exact
+            texte = self.input_longueur.text().strip()
+            n = int(texte) if texte else None
+        except ValueError:
             self.resultat.setText("❌ Spécifiez une longueur maximale valide.")
+            return
+        automate, autre = self.automate, self.autre_automate
+        self.operations.lancer(
+            "Test d'équivalence", "paires d'états explorées",
+            lambda progression: automate.mot_distinguant(autre, n, progression),
+            self.afficher_equivalence,
+            lambda message: self.resultat.setText(f"❌ Erreur lors du test d'équivalence : {message}")
+        )
+
+    def afficher_equivalence(self, mot):
+        if mot is None:
+            self.resultat.setText("✅ Les deux automates sont équivalents.")
+        else:
+            self.resultat.setText(
+                "❌ Les deux automates ne sont pas équivalents.\n"
+                f"Mot distinguant : « {mot if mot else 'ε'} »"
+            )
 
     def calculer_union(self):
         if not self.autre_automate:
@@ -0,0 +1,132 @@
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, Qt, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QProgressDialog
+
+from model.automate import OperationAnnulee
+
+
+class SignauxOperation(QObject):
+    progression = pyqtSignal(int, object)  # (fait, total ou None si inconnu)
+    termine = pyqtSignal(object)
+    echec = pyqtSignal(str)
+    annulee = pyqtSignal()
+
+
+class TacheOperation(QRunnable):
+    """
+    Exécute fonction(progression) dans un thread de travail. Le rappel de progression
+    transmet l'avancement à l'interface et lève OperationAnnulee si l'annulation a été demandée.
+    """
+
+    def __init__(self, fonction):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fonction = fonction
+        self.annulation = threading.Event()
+        self.signaux = SignauxOperation()
+
+    def _progression(self, fait, total=None):
+        if self.annulation.is_set():
+            raise OperationAnnulee()
+        self.signaux.progression.emit(fait, total)
+
+    def run(self):
+        try:
+            resultat = self.fonction(self._progression)
+        except OperationAnnulee:
+            self.signaux.annulee.emit()
+            return
+        except Exception as e:
+            self.signaux.echec.emit(str(e))
+            return
+        self.signaux.termine.emit(resultat)
+
+
+class OperationArrierePlan(QObject):
+    """
+    Opérations d'analyse hors du thread de l'interface, une à la fois, avec une fenêtre
+    de progression munie d'un bouton « Annuler ». Les widgets déclarés avec bloquer_pendant
+    sont désactivés dès le lancement (la fenêtre modale n'apparaît qu'après un délai) :
+    l'automate ne peut pas être modifié pendant que le thread de travail le lit.
+    """
+
+    DELAI_AFFICHAGE_MS = 300  # les opérations plus rapides n'affichent pas de fenêtre
+    # Échelle de la barre : QProgressDialog n'accepte que des entiers 32 bits, les totaux
+    # (nombre de mots d'une longueur donnée par exemple) peuvent être bien plus grands
+    ECHELLE = 1000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.fenetre_parente = parent
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.tache = None
+        self.dialogue = None
+        self.widgets_bloques = []
+
+    def bloquer_pendant(self, *widgets):
+        """Widgets désactivés pendant chaque opération : boutons qui lancent ou modifient"""
+        self.widgets_bloques.extend(widgets)
+
+    def _bloquer(self, bloque):
+        for widget in self.widgets_bloques:
+            widget.setEnabled(not bloque)
+
+    def est_occupe(self):
+        return self.tache is not None
+
+    def lancer(self, titre, unite, fonction, si_termine, si_echec=None):
+        """
+        Lance fonction(progression) en arrière-plan. si_termine(resultat) ou
+        si_echec(message) est appelé dans le thread de l'interface ; rien n'est
+        appelé si l'utilisateur annule. Retourne False si une opération est déjà en cours.
+        """
+        if self.tache is not None:
+            return False
+        tache = TacheOperation(fonction)
+        dialogue = QProgressDialog(titre, "Annuler", 0, 0, self.fenetre_parente)
+        dialogue.setWindowTitle(titre)
+        dialogue.setWindowModality(Qt.WindowModal)
+        dialogue.setMinimumDuration(self.DELAI_AFFICHAGE_MS)
+        dialogue.setAutoClose(False)
+        dialogue.setAutoReset(False)
+        dialogue.canceled.connect(lambda: self.annuler())
+
+        tache.signaux.progression.connect(lambda fait, total: self._avancer(titre, unite, fait, total))
+        tache.signaux.termine.connect(lambda resultat: self._fin(si_termine, resultat))
+        tache.signaux.echec.connect(lambda message: self._fin(si_echec, message))
+        tache.signaux.annulee.connect(lambda: self._fin(None, None))
+        self.tache = tache
+        self.dialogue = dialogue
+        self._bloquer(True)
+        self.pool.start(tache)
+        return True
+
+    def annuler(self):
+        """Demande l'arrêt de l'opération : elle s'interrompt au prochain point de progression"""
+        if self.tache is not None:
+            self.tache.annulation.set()
+            if self.dialogue is not None:
+                self.dialogue.setLabelText("Annulation en cours...")
+
+    def _avancer(self, titre, unite, fait, total):
+        if self.dialogue is None or self.tache.annulation.is_set():
+            return
+        if total:
+            self.dialogue.setMaximum(self.ECHELLE)
+            self.dialogue.setValue(min(fait, total) * self.ECHELLE // total)
+            self.dialogue.setLabelText(f"{titre}\n{fait} / {total} {unite}")
+        else:
+            self.dialogue.setLabelText(f"{titre}\n{fait} {unite}")
+
+    def _fin(self, rappel, valeur):
+        self.tache = None
+        self._bloquer(False)
+        if self.dialogue is not None:
+            self.dialogue.canceled.disconnect()
+            self.dialogue.close()
+            self.dialogue.deleteLater()
+            self.dialogue = None
+        if rappel is not None:
+            rappel(valeur)
@@ -0,0 +1,81 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class SignauxRendu(QObject):
+    # (génération, résultat) / (génération, message d'erreur) / (génération)
+    termine = pyqtSignal(int, object)
+    echec = pyqtSignal(int, str)
+    abandonne = pyqtSignal(int)
+
+
+class TacheRendu(QRunnable):
+    """
+    Exécute un travail préparé à l'avance (rendu dot, disposition, ...) dans un thread du pool :
+    le travail ne doit toucher ni aux objets Qt ni à l'automate. Seul le résultat revient au
+    thread de l'interface, par les signaux.
+    """
+
+    def __init__(self, generation, travail, est_obsolete):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.travail = travail
+        self.est_obsolete = est_obsolete
+        self.signaux = SignauxRendu()
+
+    def run(self):
+        if self.est_obsolete(self.generation):
+            # Une modification plus récente a été demandée entre-temps
+            self.signaux.abandonne.emit(self.generation)
+            return
+        try:
+            resultat = self.travail()
+        except Exception as e:
+            self.signaux.echec.emit(self.generation, str(e))
+            return
+        self.signaux.termine.emit(self.generation, resultat)
+
+
+class RenduArrierePlan(QObject):
+    """
+    Travaux Graphviz (disposition, rendu) hors du thread de l'interface. Seule la dernière demande compte :
+    une demande plus récente retire la précédente de la file, et le résultat d'un
+    travail déjà lancé mais devenu obsolète est ignoré (il reste utile au cache).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.generation = 0
+        self._en_attente = None
+        self._taches = set()  # références gardées jusqu'à la fin de chaque tâche
+
+    def lancer(self, travail, si_termine, si_echec):
+        """Lance travail() en arrière-plan à la place de toute demande précédente"""
+        self.annuler()
+        generation = self.generation
+        tache = TacheRendu(generation, travail, self.est_obsolete)
+        tache.signaux.termine.connect(lambda g, r: self._fin(tache, g, si_termine, r))
+        tache.signaux.echec.connect(lambda g, m: self._fin(tache, g, si_echec, m))
+        tache.signaux.abandonne.connect(lambda g: self._fin(tache, g, None, None))
+        self._taches.add(tache)
+        self._en_attente = tache
+        self.pool.start(tache)
+
+    def est_obsolete(self, generation):
+        return generation != self.generation
+
+    def annuler(self):
+        """Rend obsolètes les travaux en cours et retire de la file celui qui n'a pas démarré"""
+        self.generation += 1
+        if self._en_attente is not None and self.pool.tryTake(self._en_attente):
+            self._taches.discard(self._en_attente)
+        self._en_attente = None
+
+    def _fin(self, tache, generation, rappel, valeur):
+        self._taches.discard(tache)
+        if tache is self._en_attente:
+            self._en_attente = None
+        if rappel is not None and not self.est_obsolete(generation):
+            rappel(valeur)
@@ -0,0 +1,225 @@
+import math
+
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPainterPath, QPen, QPolygonF
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView, QStyleOptionGraphicsItem
+
+from model.disposition import (
+    SEUIL_GRAPHVIZ, cache_par_defaut, disposer_avec_graphviz, graphviz_disponible
+)
+from Window.RenduWorker import RenduArrierePlan
+
+RAYON = 18.0
+# Niveaux de détail (taille apparente d'une unité de scène) en dessous desquels on simplifie
+LOD_TEXTE = 0.6
+LOD_FLECHES = 0.3
+LOD_ARETES = 0.08
+
+COULEUR_ETAT = QColor("#e0f2fe")
+COULEUR_BORD = QColor("#0369a1")
+COULEUR_ARETE = QColor("#475569")
+
+
+def _niveau_de_detail(painter):
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+
+class ItemEtat(QGraphicsItem):
+    def __init__(self, nom, x, y, est_initial, est_final):
+        super().__init__()
+        self.nom = nom
+        self.est_initial = est_initial
+        self.est_final = est_final
+        self.setPos(x, y)
+        self.setToolTip(nom)
+
+    def boundingRect(self):
+        gauche = 3 * RAYON if self.est_initial else RAYON + 2
+        return QRectF(-gauche, -RAYON - 2, gauche + RAYON + 2, 2 * RAYON + 4)
+
+    def paint(self, painter, option, widget=None):
+        lod = _niveau_de_detail(painter)
+        cercle = QRectF(-RAYON, -RAYON, 2 * RAYON, 2 * RAYON)
+        if lod < LOD_FLECHES:
+            # Vue d'ensemble : un carré plein, plus rapide qu'un disque et indiscernable à cette échelle
+            painter.fillRect(cercle, COULEUR_BORD if self.est_final else COULEUR_ETAT.darker(130))
+            return
+        painter.setPen(QPen(COULEUR_BORD, 1.5))
+        painter.setBrush(QBrush(COULEUR_ETAT))
+        painter.drawEllipse(cercle)
+        if self.est_final:
+            painter.drawEllipse(cercle.adjusted(3, 3, -3, -3))
+        if self.est_initial:
+            painter.drawLine(QPointF(-3 * RAYON, 0), QPointF(-RAYON, 0))
+            painter.drawPolygon(_pointe(QPointF(-3 * RAYON, 0), QPointF(-RAYON, 0)))
+        if lod >= LOD_TEXTE:
+            painter.setFont(QFont("Arial", 8))
+            painter.drawText(cercle, Qt.AlignCenter, painter.fontMetrics().elidedText(self.nom, Qt.ElideRight, int(2 * RAYON) - 4))
+
+
+def _pointe(depart, arrivee, taille=7.0):
+    angle = math.atan2(arrivee.y() - depart.y(), arrivee.x() - depart.x())
+    return QPolygonF([
+        arrivee,
+        arrivee - QPointF(math.cos(angle - 0.4) * taille, math.sin(angle - 0.4) * taille),
+        arrivee - QPointF(math.cos(angle + 0.4) * taille, math.sin(angle + 0.4) * taille),
+    ])
+
+
+class ItemTransition(QGraphicsItem):
+    def __init__(self, chemin, pointe, etiquette, position_etiquette):
+        super().__init__()
+        self.chemin = chemin
+        self.pointe = pointe
+        self.etiquette = etiquette
+        self.position_etiquette = position_etiquette
+        self.setZValue(-1)
+        self._rect = chemin.boundingRect().united(pointe.boundingRect()).united(
+            QRectF(position_etiquette.x() - 40, position_etiquette.y() - 10, 80, 20)
+        ).adjusted(-2, -2, 2, 2)
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        lod = _niveau_de_detail(painter)
+        if lod < LOD_ARETES:
+            return  # trop petites pour être lisibles : seuls les états restent visibles
+        painter.setPen(QPen(COULEUR_ARETE, 1.0))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.chemin)
+        if lod >= LOD_FLECHES:
+            painter.setBrush(QBrush(COULEUR_ARETE))
+            painter.drawPolygon(self.pointe)
+        if lod >= LOD_TEXTE and self.etiquette:
+            painter.setFont(QFont("Arial", 8))
+            painter.drawText(
+                QRectF(self.position_etiquette.x() - 40, self.position_etiquette.y() - 10, 80, 20),
+                Qt.AlignCenter, self.etiquette
+            )
+
+
+def _item_transition(depart, arrivee, etiquette, points, bidirectionnelle):
+    """Construit le tracé d'une transition : B-spline de Graphviz, boucle, ou segment/courbe"""
+    chemin = QPainterPath()
+    if points:
+        p = [QPointF(x, y) for x, y in points]
+        chemin.moveTo(p[0])
+        for i in range(1, len(p) - 2, 3):
+            chemin.cubicTo(p[i], p[i + 1], p[i + 2])
+        fin = p[-1]
+        # dot arrête la courbe au bord de la flèche : on la prolonge jusqu'au cercle
+        direction = arrivee - fin
+        longueur = math.hypot(direction.x(), direction.y()) or 1.0
+        pointe_fin = arrivee - direction * (RAYON / longueur) if longueur > RAYON else fin
+        chemin.lineTo(pointe_fin)
+        return ItemTransition(chemin, _pointe(fin, pointe_fin), etiquette, chemin.pointAtPercent(0.5) + QPointF(0, -8))
+
+    if depart == arrivee:
+        # Boucle au-dessus de l'état
+        haut = depart + QPointF(0, -RAYON)
+        chemin.moveTo(depart + QPointF(-RAYON * 0.6, -RAYON * 0.8))
+        chemin.cubicTo(depart + QPointF(-RAYON * 1.5, -RAYON * 3), depart + QPointF(RAYON * 1.5, -RAYON * 3),
+                       depart + QPointF(RAYON * 0.6, -RAYON * 0.8))
+        return ItemTransition(chemin, _pointe(haut + QPointF(RAYON, -RAYON), depart + QPointF(RAYON * 0.6, -RAYON * 0.8)),
+                              etiquette, depart + QPointF(0, -RAYON * 2.6))
+
+    dx, dy = arrivee.x() - depart.x(), arrivee.y() - depart.y()
+    longueur = math.hypot(dx, dy) or 1.0
+    ux, uy = dx / longueur, dy / longueur
+    debut = depart + QPointF(ux * RAYON, uy * RAYON)
+    fin = arrivee - QPointF(ux * RAYON, uy * RAYON)
+    chemin.moveTo(debut)
+    if bidirectionnelle:
+        # Les deux sens d'un même couple sont courbés de part et d'autre
+        controle = (debut + fin) / 2 + QPointF(-uy * 25, ux * 25)
+        chemin.quadTo(controle, fin)
+        return ItemTransition(chemin, _pointe(controle, fin), etiquette, chemin.pointAtPercent(0.5) + QPointF(0, -8))
+    chemin.lineTo(fin)
+    return ItemTransition(chemin, _pointe(debut, fin), etiquette, (debut + fin) / 2 + QPointF(0, -8))
+
+
+class VueAutomate(QGraphicsView):
+    """
+    Visualiseur interactif : la disposition est calculée une fois par structure et mise en
+    cache ; la molette zoome, le glisser déplace la vue. Seuls les éléments visibles sont
+    dessinés, avec moins de détails quand la vue est dézoomée.
+    """
+
+    ZOOM_MIN = 0.02
+    ZOOM_MAX = 8.0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setScene(QGraphicsScene(self))
+        self.scene().setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setBackgroundBrush(QBrush(Qt.white))
+        self.travaux = RenduArrierePlan(self)
+
+    def afficher(self, automate):
+        """Affiche la meilleure disposition disponible, puis celle de Graphviz quand elle est prête"""
+        cache = cache_par_defaut()
+        hash_structurel = automate.hash_structurel()  # O(T log T) : calculé une seule fois par affichage
+        disposition = cache.disposition(automate, hash_structurel)
+        self._dessiner(disposition)
+        if disposition.moteur == "graphviz" or len(automate.etats) > SEUIL_GRAPHVIZ or not graphviz_disponible():
+            self.travaux.annuler()
+            return
+
+        # La source et la clé sont figées ici : l'automate peut changer pendant le calcul
+        source = automate.source_dot()
+        cle = cache.cle(hash_structurel, "graphviz")
+
+        def calculer():
+            resultat = disposer_avec_graphviz(source)
+            cache.ecrire(cle, resultat)
+            return resultat
+
+        self.travaux.lancer(calculer, self._dessiner, lambda message: None)
+
+    def effacer(self):
+        self.travaux.annuler()
+        self.scene().clear()
+
+    def _dessiner(self, disposition):
+        scene = self.scene()
+        scene.clear()
+        positions = {}
+        for nom, x, y, est_initial, est_final in disposition.etats:
+            scene.addItem(ItemEtat(nom, x, y, est_initial, est_final))
+            positions[nom] = QPointF(x, y)
+
+        couples = {(source, destination) for source, destination, _, _ in disposition.aretes}
+        for source, destination, etiquette, points in disposition.aretes:
+            if source not in positions or destination not in positions:
+                continue
+            bidirectionnelle = source != destination and (destination, source) in couples
+            scene.addItem(_item_transition(positions[source], positions[destination], etiquette, points, bidirectionnelle))
+
+        scene.setSceneRect(QRectF(0, 0, disposition.largeur, disposition.hauteur).adjusted(-60, -60, 60, 60))
+        self.ajuster()
+
+    def ajuster(self):
+        """Cadre tout l'automate, sans agrandir les petits automates au-delà de leur taille réelle"""
+        rect = self.scene().sceneRect()
+        if rect.isEmpty():
+            return
+        self.fitInView(rect, Qt.KeepAspectRatio)
+        if self.transform().m11() > 1.0:
+            self.resetTransform()
+            self.centerOn(rect.center())
+
+    def wheelEvent(self, event):
+        facteur = 1.15 ** (event.angleDelta().y() / 120)
+        echelle = self.transform().m11() * facteur
+        if self.ZOOM_MIN <= echelle <= self.ZOOM_MAX:
+            self.scale(facteur, facteur)
+
+    def mouseDoubleClickEvent(self, event):
+        self.ajuster()
+        super().mouseDoubleClickEvent(event)
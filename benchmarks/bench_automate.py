@@ -0,0 +1,291 @@
+"""
+Mesure des opérations de model/automate.py sur des automates aléatoires, pour chaque
+combinaison de nombre d'états, taille d'alphabet et densité de transitions :
+
+    python -m benchmarks.bench_automate --etats 10,100,1000 --alphabets 2,8
+    python -m benchmarks.bench_automate --reference reference.json
+
+Les résultats sont écrits en JSON (durée minimale et médiane de chaque mesure) ; avec
+--reference, ils sont comparés à un résultat précédent et le code de retour vaut 1 en
+cas de régression. N'importe ni PyQt5 ni graphviz.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+from benchmarks import comparer
+from model.automate import Automate, OperationAnnulee
+
+ETATS = (10, 100, 1000)
+ALPHABETS = (2, 8)
+# Nombre moyen de destinations par couple (état, symbole) ; plafonné à 1 pour les automates déterministes
+DENSITES = (0.5, 1.0, 2.0)
+REPETITIONS = 5
+BUDGET = 5.0  # secondes par mesure ; une opération plus longue est interrompue (statut depasse)
+PROPORTION_FINAUX = 0.3
+NB_MOTS = 200
+LONGUEUR_MOT = 32
+# Nombre visé de mots de longueur maximale pour generer_mots_acceptes
+MOTS_GENERES = 4096
+DOSSIER_RESULTATS = Path(__file__).parent / "resultats"
+
+
+def automate_aleatoire(nb_etats, taille_alphabet, densite, deterministe, graine):
+    """
+    Automate q0..q{n-1} d'état initial q0. Déterministe : chaque couple (état, symbole) a une
+    transition avec la probabilité min(densite, 1). Sinon : densite destinations en moyenne.
+    """
+    rng = random.Random(graine)
+    alphabet = symboles(taille_alphabet)
+    sources, etiquettes, destinations = [], [], []
+    for source in range(nb_etats):
+        for symbole in alphabet:
+            if deterministe:
+                nombre = 1 if rng.random() < min(densite, 1.0) else 0
+            else:
+                nombre = min(nb_etats, int(densite) + (rng.random() < densite - int(densite)))
+            for destination in rng.sample(range(nb_etats), nombre):
+                sources.append(source)
+                etiquettes.append(symbole)
+                destinations.append(destination)
+    finaux = [i for i in range(nb_etats) if rng.random() < PROPORTION_FINAUX]
+    return Automate.from_arrays(
+        [f"q{i}" for i in range(nb_etats)], finaux, 0, sources, etiquettes, destinations,
+        nom="afd" if deterministe else "afn", alphabet=alphabet
+    )
+
+
+def symboles(taille_alphabet):
+    if taille_alphabet <= len(string.ascii_lowercase):
+        return list(string.ascii_lowercase[:taille_alphabet])
+    return [f"s{i}" for i in range(taille_alphabet)]
+
+
+class Cas:
+    """Données d'entrée d'une combinaison de paramètres, construites à la demande et hors chronomètre"""
+
+    def __init__(self, etats, alphabet, densite, graine):
+        self.etats, self.alphabet, self.densite, self.graine = etats, alphabet, densite, graine
+
+    @cached_property
+    def afn(self):
+        return automate_aleatoire(self.etats, self.alphabet, self.densite, False, self.graine)
+
+    @cached_property
+    def afd(self):
+        return automate_aleatoire(self.etats, self.alphabet, self.densite, True, self.graine)
+
+    @cached_property
+    def afd_bis(self):
+        return automate_aleatoire(self.etats, self.alphabet, self.densite, True, self.graine + 1)
+
+    @cached_property
+    def afd_complet(self):
+        return self.afd.completer()
+
+    @cached_property
+    def afd_minimal(self):
+        return self.afd.minimiser()
+
+    @cached_property
+    def dict_afn(self):
+        return self.afn.to_dict()
+
+    @cached_property
+    def mots(self):
+        rng = random.Random(self.graine)
+        alphabet = symboles(self.alphabet)
+        return ["".join(rng.choices(alphabet, k=LONGUEUR_MOT)) for _ in range(NB_MOTS)]
+
+    @cached_property
+    def longueur_mots(self):
+        # Environ MOTS_GENERES mots possibles à la longueur maximale, quel que soit l'alphabet
+        return max(1, round(math.log(MOTS_GENERES) / math.log(max(2, self.alphabet))))
+
+
+# Chaque opération reçoit le cas et le rappel de progression, transmis aux méthodes qui l'acceptent
+OPERATIONS = {
+    "reconnait": lambda c, p: [c.afd.reconnait(m) for m in c.mots],
+    "reconnait_afn": lambda c, p: [c.afn.reconnait(m) for m in c.mots],
+    "determiniser": lambda c, p: c.afn.determiniser(p),
+    "minimiser": lambda c, p: c.afd.minimiser(p),
+    "completer": lambda c, p: c.afd.completer(p),
+    "complement": lambda c, p: c.afd_complet.complement(),
+    "union": lambda c, p: c.afd.union(c.afd_bis),
+    "intersection": lambda c, p: c.afd.intersection(c.afd_bis),
+    # Automates équivalents : le parcours est complet, c'est le pire cas
+    "est_equivalent": lambda c, p: c.afd.est_equivalent(c.afd_minimal, progression=p),
+    "generer_mots_acceptes": lambda c, p: c.afd.generer_mots_acceptes(c.longueur_mots, p),
+    "to_dict": lambda c, p: c.afn.to_dict(),
+    "from_dict": lambda c, p: Automate.from_dict(c.dict_afn),
+    # Génération du texte DOT seulement : le rendu par dot dépend de Graphviz, pas du modèle
+    "to_graphviz": lambda c, p: c.afn.source_dot(),
+}
+
+
+def mesurer(fonction, repetitions=REPETITIONS, budget=BUDGET):
+    """
+    Exécute fonction(progression) jusqu'à repetitions fois, ramasse-miettes suspendu comme
+    dans timeit. Retourne (durées, résultat) ; les répétitions s'arrêtent une fois le budget
+    épuisé, et une opération dotée d'un rappel de progression est interrompue au-delà.
+    """
+    fin = time.perf_counter() + budget
+
+    def progression(fait, total=None):
+        if time.perf_counter() > fin:
+            raise OperationAnnulee()
+
+    durees, resultat = [], None
+    for _ in range(repetitions):
+        gc.collect()
+        gc.disable()
+        try:
+            debut = time.perf_counter()
+            resultat = fonction(progression)
+            durees.append(time.perf_counter() - debut)
+        except OperationAnnulee:
+            # Interrompue après au moins une exécution complète : les durées obtenues suffisent
+            if not durees:
+                raise
+            break
+        finally:
+            gc.enable()
+        if time.perf_counter() > fin:
+            break
+    return durees, resultat
+
+
+def taille(resultat):
+    """Taille du résultat, utile pour relier une durée à l'explosion d'une construction"""
+    if isinstance(resultat, Automate):
+        return len(resultat.etats)
+    if isinstance(resultat, (list, str)):
+        return len(resultat)
+    return None
+
+
+def executer(etats, alphabets, densites, operations, repetitions=REPETITIONS, budget=BUDGET, graine=0,
+             progression=None):
+    """Mesure chaque opération sur chaque combinaison de paramètres ; retourne le résultat complet"""
+    grille = [(n, k, d) for n in etats for k in alphabets for d in densites]
+    total = len(grille) * len(operations)
+    mesures = []
+    for n, k, d in grille:
+        cas = Cas(n, k, d, graine)
+        for operation in operations:
+            mesure = {"operation": operation, "etats": n, "alphabet": k, "densite": d}
+            try:
+                durees, resultat = mesurer(lambda p: OPERATIONS[operation](cas, p), repetitions, budget)
+                mesure.update({
+                    "statut": "ok", "repetitions": len(durees), "min": min(durees),
+                    "mediane": statistics.median(durees), "taille_resultat": taille(resultat),
+                })
+            except OperationAnnulee:
+                mesure["statut"] = "depasse"
+            except Exception as e:
+                mesure.update({"statut": "echec", "erreur": f"{type(e).__name__}: {e}"})
+            mesures.append(mesure)
+            if progression is not None:
+                progression(len(mesures), total, mesure)
+    return {
+        "environnement": environnement(),
+        "parametres": {
+            "etats": list(etats), "alphabets": list(alphabets), "densites": list(densites),
+            "repetitions": repetitions, "budget": budget, "graine": graine,
+        },
+        "mesures": mesures,
+    }
+
+
+def environnement():
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "systeme": platform.platform(),
+        "processeur": platform.processor() or platform.machine(),
+        "coeurs": os.cpu_count(),
+    }
+
+
+def afficher_mesure(mesure):
+    parametres = f"{mesure['operation']:<24}{mesure['etats']:>7}{mesure['alphabet']:>4}{mesure['densite']:>9}"
+    if mesure["statut"] == "ok":
+        print(f"{parametres}{mesure['min'] * 1000:>12.3f}{mesure['mediane'] * 1000:>14.3f}"
+              f"{mesure['taille_resultat'] if mesure['taille_resultat'] is not None else '-':>10}")
+    elif mesure["statut"] == "depasse":
+        print(f"{parametres}  budget dépassé")
+    else:
+        print(f"{parametres}  échec : {mesure['erreur']}")
+
+
+def lire_liste(texte, conversion):
+    return [conversion(valeur) for valeur in texte.split(",") if valeur.strip()]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench_automate",
+        description="Mesure les opérations sur les automates pour une grille de tailles."
+    )
+    parser.add_argument("--etats", default=",".join(map(str, ETATS)), help="nombres d'états, séparés par des virgules")
+    parser.add_argument("--alphabets", default=",".join(map(str, ALPHABETS)), help="tailles d'alphabet")
+    parser.add_argument("--densites", default=",".join(map(str, DENSITES)),
+                        help="nombre moyen de destinations par couple (état, symbole)")
+    parser.add_argument("--operations", default=",".join(OPERATIONS),
+                        help=f"opérations mesurées (défaut : toutes) parmi {', '.join(OPERATIONS)}")
+    parser.add_argument("-n", "--repetitions", type=int, default=REPETITIONS, help="répétitions par mesure")
+    parser.add_argument("--budget", type=float, default=BUDGET, help="durée maximale d'une mesure, en secondes")
+    parser.add_argument("--graine", type=int, default=0, help="graine des automates aléatoires")
+    parser.add_argument("-o", "--sortie", help=f"fichier JSON des résultats (défaut : {DOSSIER_RESULTATS.name}/<date>.json)")
+    parser.add_argument("--reference", help="résultats précédents à comparer ; code de retour 1 en cas de régression")
+    comparer.ajouter_options(parser)
+    args = parser.parse_args(arguments)
+
+    try:
+        etats = lire_liste(args.etats, int)
+        alphabets = lire_liste(args.alphabets, int)
+        densites = lire_liste(args.densites, float)
+    except ValueError as e:
+        parser.error(str(e))
+    operations = lire_liste(args.operations, str.strip)
+    inconnues = [o for o in operations if o not in OPERATIONS]
+    if inconnues:
+        parser.error(f"opération(s) inconnue(s) : {', '.join(inconnues)}")
+    # Référence lue avant les mesures : une erreur de chemin n'attend pas la fin du benchmark
+    reference = None
+    if args.reference:
+        try:
+            reference = comparer.charger_resultats(args.reference)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    print(f"{'Opération':<24}{'États':>7}{'Σ':>4}{'Densité':>9}{'Min (ms)':>12}{'Médiane (ms)':>14}{'Taille':>10}")
+    resultats = executer(etats, alphabets, densites, operations, args.repetitions, args.budget, args.graine,
+                         lambda fait, total, mesure: afficher_mesure(mesure))
+
+    sortie = Path(args.sortie) if args.sortie else DOSSIER_RESULTATS / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    sortie.parent.mkdir(parents=True, exist_ok=True)
+    with open(sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    print(f"Résultats : {sortie}")
+
+    if reference is not None:
+        print()
+        return 1 if comparer.rapporter(reference, resultats, args.seuil, args.critere, args.tout) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Comparaison de deux fichiers de résultats de benchmarks/bench_automate.py :
+
+    python -m benchmarks.comparer reference.json nouveau.json --seuil 0.2
+
+Une mesure est une régression si elle est plus lente que la référence de plus de
+seuil (en proportion) et d'au moins PLANCHER secondes ; le code de retour vaut alors 1.
+"""
+import argparse
+import json
+import sys
+
+SEUIL = 0.2
+# En dessous de cet écart absolu, la différence relève du bruit de mesure
+PLANCHER = 1e-4
+
+
+def charger_resultats(chemin):
+    with open(chemin, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def cle(mesure):
+    return mesure["operation"], mesure["etats"], mesure["alphabet"], mesure["densite"]
+
+
+def comparer(reference, actuel, seuil=SEUIL, critere="min", plancher=PLANCHER):
+    """
+    Compare mesure par mesure deux résultats chargés. Retourne une liste de dictionnaires
+    (operation, etats, alphabet, densite, reference, actuel, rapport, verdict) où verdict vaut
+    regression, amelioration, stable, nouveau, disparu ou depasse (plus mesurable dans le budget).
+    """
+    anciennes = {cle(m): m for m in reference["mesures"]}
+    nouvelles = {cle(m): m for m in actuel["mesures"]}
+    lignes = []
+    for k in list(anciennes) + [k for k in nouvelles if k not in anciennes]:
+        ancienne, nouvelle = anciennes.get(k), nouvelles.get(k)
+        avant = ancienne[critere] if ancienne and ancienne["statut"] == "ok" else None
+        apres = nouvelle[critere] if nouvelle and nouvelle["statut"] == "ok" else None
+        if nouvelle is None:
+            verdict = "disparu"
+        elif apres is None:
+            # Une mesure qui passait et ne passe plus est une régression ; sinon rien à comparer
+            verdict = "regression" if avant is not None else nouvelle["statut"]
+        elif avant is None:
+            verdict = "nouveau"
+        elif apres > avant * (1 + seuil) and apres - avant >= plancher:
+            verdict = "regression"
+        elif apres < avant / (1 + seuil) and avant - apres >= plancher:
+            verdict = "amelioration"
+        else:
+            verdict = "stable"
+        lignes.append({
+            "operation": k[0], "etats": k[1], "alphabet": k[2], "densite": k[3],
+            "reference": avant, "actuel": apres,
+            "rapport": apres / avant if avant and apres is not None else None,
+            "verdict": verdict,
+        })
+    return lignes
+
+
+def afficher_comparaison(lignes, tout=False):
+    """Affiche les régressions et améliorations (toutes les lignes avec tout=True)"""
+    print(f"{'Opération':<24}{'États':>7}{'Σ':>4}{'Densité':>9}{'Réf. (ms)':>12}{'Actuel (ms)':>13}{'Rapport':>9}  Verdict")
+    for ligne in lignes:
+        if not tout and ligne["verdict"] == "stable":
+            continue
+        avant = f"{ligne['reference'] * 1000:.3f}" if ligne["reference"] is not None else "-"
+        apres = f"{ligne['actuel'] * 1000:.3f}" if ligne["actuel"] is not None else "-"
+        rapport = f"{ligne['rapport']:.2f}x" if ligne["rapport"] is not None else "-"
+        print(f"{ligne['operation']:<24}{ligne['etats']:>7}{ligne['alphabet']:>4}{ligne['densite']:>9}"
+              f"{avant:>12}{apres:>13}{rapport:>9}  {ligne['verdict']}")
+    bilan = {}
+    for ligne in lignes:
+        bilan[ligne["verdict"]] = bilan.get(ligne["verdict"], 0) + 1
+    print(", ".join(f"{n} {verdict}" for verdict, n in sorted(bilan.items())))
+
+
+def environnements_differents(reference, actuel):
+    """Clés de l'environnement (Python, processeur...) qui diffèrent : la comparaison est alors indicative"""
+    avant, apres = reference.get("environnement", {}), actuel.get("environnement", {})
+    return [k for k in sorted(avant.keys() | apres.keys()) if k != "date" and avant.get(k) != apres.get(k)]
+
+
+def rapporter(reference, actuel, seuil=SEUIL, critere="min", tout=False):
+    """Compare, affiche et retourne le nombre de régressions"""
+    differences = environnements_differents(reference, actuel)
+    if differences:
+        print(f"Attention : environnements différents ({', '.join(differences)}), comparaison indicative.")
+    lignes = comparer(reference, actuel, seuil, critere)
+    afficher_comparaison(lignes, tout)
+    return sum(1 for ligne in lignes if ligne["verdict"] == "regression")
+
+
+def ajouter_options(parser):
+    parser.add_argument("--seuil", type=float, default=SEUIL,
+                        help=f"ralentissement relatif signalé comme régression (défaut : {SEUIL})")
+    parser.add_argument("--critere", choices=("min", "mediane"), default="min",
+                        help="durée comparée (défaut : min, la moins sensible au bruit)")
+    parser.add_argument("--tout", action="store_true", help="affiche aussi les mesures stables")
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.comparer",
+        description="Compare deux fichiers de résultats de benchmarks et signale les régressions."
+    )
+    parser.add_argument("reference", help="résultats de référence (JSON)")
+    parser.add_argument("actuel", help="nouveaux résultats (JSON)")
+    ajouter_options(parser)
+    args = parser.parse_args(arguments)
+
+    try:
+        reference, actuel = charger_resultats(args.reference), charger_resultats(args.actuel)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 1 if rapporter(reference, actuel, args.seuil, args.critere, args.tout) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
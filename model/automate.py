@@ -1,10 +1,56 @@
 from collections import deque
+from contextlib import contextmanager
+import gc
+import hashlib
 from itertools import product
-import graphviz
-
+import json
+import numbers
+import os
+import tempfile
+import threading
+
+from model import format_binaire, json_flux
+from model.compiled_dfa import CompiledDFA
 from model.etat import Etat
 from model.transition import Transition
 
+EPSILON = 'ε'
+SYMBOLES_EPSILON = frozenset({EPSILON, ''})  # '' est accepté comme ε dans les fichiers existants
+# Nombre d'itérations entre deux appels du rappel de progression des opérations longues
+PAS_PROGRESSION = 1024
+
+
+class OperationAnnulee(Exception):
+    """Levée par un rappel de progression pour interrompre l'opération en cours"""
+
+
+# Suspensions du ramasse-miettes en cours, tous threads confondus (voir _sans_ramasse_miettes)
+_verrou_gc = threading.Lock()
+_suspensions_gc = 0
+_gc_actif_avant = False
+
+
+@contextmanager
+def _sans_ramasse_miettes():
+    """
+    Suspend le ramasse-miettes pendant la création en masse d'objets (aucun cycle n'est créé).
+    Le ramasse-miettes est global au processus : les suspensions sont comptées, et il n'est
+    réactivé qu'à la fin de la dernière, même si des opérations se chevauchent dans des threads.
+    """
+    global _suspensions_gc, _gc_actif_avant
+    with _verrou_gc:
+        if _suspensions_gc == 0:
+            _gc_actif_avant = gc.isenabled()
+            gc.disable()
+        _suspensions_gc += 1
+    try:
+        yield
+    finally:
+        with _verrou_gc:
+            _suspensions_gc -= 1
+            if _suspensions_gc == 0 and _gc_actif_avant:
+                gc.enable()
+
 
 class Automate:
     def __init__(self, nom, alphabet=None):
@@ -13,40 +59,302 @@ class Automate:
         self.transitions = []  # liste d'objets Transition
         self.alphabet = alphabet if alphabet else set()
         self.etat_initial = None  # nom de l'état initial
+        # Index d'adjacence, maintenu par ajouter_transition / supprimer_*
+        self._succ = {}  # {source: {symbole: {destinations}}}
+        self._pred = {}  # {destination: {symbole: {sources}}}, None s'il est à reconstruire
+        # Données dérivées (ε-fermetures, ...) recalculées après chaque modification
+        self._caches = {}
 
     def ajouter_etat(self, nom, est_initial=False, est_final=False):
         if nom not in self.etats:
             self.etats[nom] = Etat(nom, est_initial, est_final)
+            self._caches.clear()
         if est_initial:
             self.etat_initial = nom
 
     def ajouter_transition(self, source, symbole, destination):
-        if source not in self.etats or destination not in self.etats:
-            raise ValueError("Source ou destination non existant dans les états")
+        self.ajouter_etat(source)
+        self.ajouter_etat(destination)
         self.transitions.append(Transition(source, symbole, destination))
+        if symbole not in SYMBOLES_EPSILON:
+            self.alphabet.add(symbole)
+        self._indexer(source, symbole, destination)
+        self._caches.clear()
 
-    def est_deterministe(self):
-        transitions_par_etat = {}
-        for t in self.transitions:
-            key = (t.source, t.symbole)
-            if key in transitions_par_etat:
-                return False
-            transitions_par_etat[key] = t.destination
-        nb_initiaux = sum(1 for e in self.etats.values() if e.est_initial)
-        return nb_initiaux == 1
+    def ajouter_transitions_lot(self, transitions):
+        """
+        Ajoute des transitions (source, symbole, destination) en une seule passe :
+        les états manquants sont créés une fois, l'index et l'alphabet remplis directement.
+        """
+        with _sans_ramasse_miettes():
+            transitions = list(transitions)
+            etats = self.etats
+            for source, _, destination in transitions:
+                if source not in etats:
+                    etats[source] = Etat(source)
+                if destination not in etats:
+                    etats[destination] = Etat(destination)
+            if transitions:
+                self._ajouter_colonnes(*zip(*transitions))
+
+    @staticmethod
+    def from_arrays(etats, finaux, initial, sources, symboles, destinations, nom="automate", alphabet=None):
+        """
+        Construit un automate à partir de tableaux parallèles : etats liste les noms,
+        sources et destinations sont des indices dans etats, finaux l'ensemble des indices
+        finaux et initial un indice, une liste d'indices ou None.
+        """
+        etats = list(etats)
+        nb_etats = len(etats)
+        if len(set(etats)) != nb_etats:
+            raise ValueError("Les noms d'états doivent être uniques.")
+        if not len(sources) == len(symboles) == len(destinations):
+            raise ValueError("Les tableaux de transitions doivent avoir la même longueur.")
+        if initial is None:
+            initiaux = []
+        elif isinstance(initial, numbers.Integral):  # int ou entier NumPy
+            initiaux = [initial]
+        else:
+            initiaux = sorted(initial)
+        finaux = set(finaux)
+        for indices in (sources, destinations, initiaux, finaux):
+            if len(indices) and (min(indices) < 0 or max(indices) >= nb_etats):
+                raise ValueError("Indice d'état hors limites.")
+
+        a = Automate(nom, alphabet=set(alphabet) if alphabet else None)
+        initiaux_set = set(initiaux)
+        with _sans_ramasse_miettes():
+            # Chaque nom n'est stocké qu'une fois : transitions et index partagent les mêmes objets
+            a.etats = {e: Etat(e, i in initiaux_set, i in finaux) for i, e in enumerate(etats)}
+            a._ajouter_colonnes([etats[i] for i in sources], symboles, [etats[i] for i in destinations])
+        if initiaux:
+            # Le premier dans l'ordre des états, comme get_etat_initial()
+            a.etat_initial = etats[initiaux[0]]
+        return a
+
+    def _ajouter_colonnes(self, sources, symboles, destinations):
+        """
+        Remplit transitions, index des successeurs et alphabet à partir de colonnes parallèles ;
+        les états doivent déjà exister. L'index des prédécesseurs sera reconstruit à la demande.
+        """
+        self.transitions.extend(map(Transition, sources, symboles, destinations))
+        succ = self._succ
+        for source, symbole, destination in zip(sources, symboles, destinations):
+            par_symbole = succ.get(source)
+            if par_symbole is None:
+                par_symbole = succ[source] = {}
+            cibles = par_symbole.get(symbole)
+            if cibles is None:
+                par_symbole[symbole] = {destination}
+            else:
+                cibles.add(destination)
+        self.alphabet |= set(symboles) - SYMBOLES_EPSILON
+        self._pred = None
+        self._caches.clear()
+
+    def _index_pred(self):
+        """Index des prédécesseurs, reconstruit depuis celui des successeurs si nécessaire"""
+        if self._pred is None:
+            pred = {}
+            with _sans_ramasse_miettes():
+                for source, sortantes in self._succ.items():
+                    for symbole, destinations in sortantes.items():
+                        for destination in destinations:
+                            pred.setdefault(destination, {}).setdefault(symbole, set()).add(source)
+            self._pred = pred
+        return self._pred
+
+    def _indexer(self, source, symbole, destination):
+        self._succ.setdefault(source, {}).setdefault(symbole, set()).add(destination)
+        if self._pred is not None:
+            self._pred.setdefault(destination, {}).setdefault(symbole, set()).add(source)
+
+    def _desindexer(self, source, symbole, destination):
+        for index, cle, valeur in ((self._succ, source, destination), (self._pred, destination, source)):
+            if index is None:
+                continue
+            par_symbole = index.get(cle)
+            if not par_symbole or symbole not in par_symbole:
+                continue
+            par_symbole[symbole].discard(valeur)
+            if not par_symbole[symbole]:
+                del par_symbole[symbole]
+            if not par_symbole:
+                del index[cle]
+
+    def successeurs(self, etat_nom, symbole):
+        """Retourne l'ensemble des destinations de (etat_nom, symbole)"""
+        return self._succ.get(etat_nom, {}).get(symbole, set())
+
+    def predecesseurs(self, etat_nom, symbole):
+        """Retourne l'ensemble des sources menant à etat_nom par symbole"""
+        return self._index_pred().get(etat_nom, {}).get(symbole, set())
+
+    def transitions_sortantes(self, etat_nom):
+        """Retourne le dictionnaire {symbole: {destinations}} de etat_nom"""
+        return self._succ.get(etat_nom, {})
+
+    def _successeurs_epsilon(self, etat_nom):
+        sortantes = self._succ.get(etat_nom, {})
+        return [d for symbole in SYMBOLES_EPSILON for d in sortantes.get(symbole, ())]
+
+    def a_transitions_epsilon(self):
+        # Consulté à chaque pas de simulation : mis en cache avec les ε-fermetures
+        present = self._caches.get("epsilon")
+        if present is None:
+            present = self._caches["epsilon"] = any(
+                symbole in SYMBOLES_EPSILON for sortantes in self._succ.values() for symbole in sortantes
+            )
+        return present
+
+    def fermeture_epsilon(self, etat_nom):
+        """États atteignables depuis etat_nom par des ε-transitions (etat_nom compris)"""
+        return self._fermetures()[etat_nom]
+
+    def _fermetures(self):
+        """
+        ε-fermetures de tous les états, calculées en une passe sur les composantes
+        fortement connexes du graphe des ε-transitions (Tarjan) et mises en cache
+        jusqu'à la prochaine modification de l'automate.
+        """
+        fermetures = self._caches.get("fermetures")
+        if fermetures is not None:
+            return fermetures
+
+        fermetures = {}
+        numero, remontee = {}, {}
+        pile, sur_pile = [], set()
+        for racine in self.etats:
+            if racine in numero:
+                continue
+            numero[racine] = remontee[racine] = len(numero)
+            pile.append(racine)
+            sur_pile.add(racine)
+            travail = [(racine, iter(self._successeurs_epsilon(racine)))]
+            while travail:
+                etat, suivants = travail[-1]
+                avance = False
+                for suivant in suivants:
+                    if suivant not in numero:
+                        numero[suivant] = remontee[suivant] = len(numero)
+                        pile.append(suivant)
+                        sur_pile.add(suivant)
+                        travail.append((suivant, iter(self._successeurs_epsilon(suivant))))
+                        avance = True
+                        break
+                    if suivant in sur_pile:
+                        remontee[etat] = min(remontee[etat], numero[suivant])
+                if avance:
+                    continue
+                travail.pop()
+                if travail:
+                    parent = travail[-1][0]
+                    remontee[parent] = min(remontee[parent], remontee[etat])
+                if remontee[etat] != numero[etat]:
+                    continue
+                # etat est la racine d'une composante : les composantes qu'elle atteint
+                # sont déjà terminées, leur fermeture est connue.
+                composante = []
+                while True:
+                    membre = pile.pop()
+                    sur_pile.discard(membre)
+                    composante.append(membre)
+                    if membre == etat:
+                        break
+                fermeture = set(composante)
+                for membre in composante:
+                    for suivant in self._successeurs_epsilon(membre):
+                        if suivant not in fermeture:
+                            fermeture.update(fermetures[suivant])
+                fermeture = frozenset(fermeture)
+                for membre in composante:
+                    fermetures[membre] = fermeture
+
+        self._caches["fermetures"] = fermetures
+        return fermetures
+
+    def _fermer(self, etats):
+        """ε-fermeture d'un ensemble d'états"""
+        if not self.a_transitions_epsilon():
+            return frozenset(etats)
+        fermetures = self._fermetures()
+        resultat = set()
+        for etat in etats:
+            if etat not in resultat:
+                resultat.update(fermetures[etat])
+        return frozenset(resultat)
+
+    def _cofermer(self, etats):
+        """États depuis lesquels un état de etats est atteignable par des ε-transitions"""
+        resultat = set(etats)
+        if not self.a_transitions_epsilon():
+            return frozenset(resultat)
+        a_traiter = list(resultat)
+        while a_traiter:
+            etat = a_traiter.pop()
+            predecesseurs = self._index_pred().get(etat, {})
+            for symbole in SYMBOLES_EPSILON:
+                for source in predecesseurs.get(symbole, ()):
+                    if source not in resultat:
+                        resultat.add(source)
+                        a_traiter.append(source)
+        return frozenset(resultat)
+
+    def _ensemble_initial(self):
+        return self._fermer(e.nom for e in self.etats.values() if e.est_initial)
+
+    def _etape(self, ensemble, symbole):
+        """Ensemble des états atteints depuis ensemble en lisant symbole (ε-fermeture comprise)"""
+        suivants = set()
+        for etat in ensemble:
+            suivants.update(self.successeurs(etat, symbole))
+        return self._fermer(suivants)
+
+    def supprimer_epsilon(self):
+        """Retourne un automate équivalent sans ε-transitions"""
+        fermetures = self._fermetures()
+        nouvel_automate = Automate(self.nom + "_sans_epsilon", alphabet=self.alphabet - SYMBOLES_EPSILON)
+        for nom, etat in self.etats.items():
+            nouvel_automate.ajouter_etat(
+                nom,
+                est_initial=etat.est_initial,
+                est_final=any(self.etats[q].est_final for q in fermetures[nom])
+            )
+        transitions = []
+        for nom in self.etats:
+            # δ'(p, a) = ∪ δ(q, a) pour q dans la ε-fermeture de p
+            vus = set()
+            for q in fermetures[nom]:
+                for symbole, destinations in self.transitions_sortantes(q).items():
+                    if symbole in SYMBOLES_EPSILON:
+                        continue
+                    for destination in destinations:
+                        if (symbole, destination) not in vus:
+                            vus.add((symbole, destination))
+                            transitions.append((nom, symbole, destination))
+        nouvel_automate.ajouter_transitions_lot(transitions)
+        return nouvel_automate
+
+    def _est_simple(self):
+        """Vrai si un mot se lit en suivant une seule transition à chaque pas (ni ε ni choix)"""
+        simple = self._caches.get("simple")
+        if simple is None:
+            simple = (
+                sum(1 for e in self.etats.values() if e.est_initial) <= 1
+                and not self.a_transitions_epsilon()
+                and all(len(d) == 1 for sortantes in self._succ.values() for d in sortantes.values())
+            )
+            self._caches["simple"] = simple
+        return simple
 
     def est_complet(self):
         """Vérifie si l'automate est complet (tous les états ont des transitions pour tous les symboles)"""
         for etat in self.etats:
-            symboles_vus = set()
-            for t in self.transitions:
-                if t.source == etat:
-                    symboles_vus.add(t.symbole)
-            if symboles_vus != self.alphabet:
+            if self.transitions_sortantes(etat).keys() != self.alphabet:
                 return False
         return True
 
-    def completer(self):
+    def completer(self, progression=None):
         if not self.est_deterministe():
             raise ValueError("L'automate doit être déterministe pour être complété.")
 
@@ -56,21 +364,24 @@ class Automate:
         for etat in self.etats.values():
             nouvel_automate.ajouter_etat(etat.nom, est_initial=etat.est_initial, est_final=etat.est_final)
 
-        # Ajouter un état puits si nécessaire
+        # Copier les transitions existantes, puis diriger les transitions manquantes vers le puits
         etat_puits = "PUITS"
-        if etat_puits not in self.etats:
+        suffixe = 1
+        while etat_puits in self.etats:
+            etat_puits = f"PUITS_{suffixe}"
+            suffixe += 1
+        transitions = [(t.source, t.symbole, t.destination) for t in self.transitions]
+        for i, etat in enumerate(self.etats):
+            if progression is not None and i % PAS_PROGRESSION == 0:
+                progression(i, len(self.etats))
+            for symb in sorted(self.alphabet - self.transitions_sortantes(etat).keys()):
+                transitions.append((etat, symb, etat_puits))
+
+        # L'état puits n'est ajouté que s'il sert, avec une boucle par symbole
+        if len(transitions) > len(self.transitions):
             nouvel_automate.ajouter_etat(etat_puits, est_initial=False, est_final=False)
-
-        # Ajouter transitions manquantes vers l'état puits
-        for etat in nouvel_automate.etats.values():
-            symboles_vus = {t.symbole for t in nouvel_automate.transitions if t.source == etat.nom}
-            symboles_manquants = nouvel_automate.alphabet - symboles_vus
-            for symb in symboles_manquants:
-                nouvel_automate.ajouter_transition(etat.nom, symb, etat_puits)
-
-        # Pour l'état puits, ajouter toutes les transitions vers lui-même
-        for symb in nouvel_automate.alphabet:
-            nouvel_automate.ajouter_transition(etat_puits, symb, etat_puits)
+            transitions.extend((etat_puits, symb, etat_puits) for symb in sorted(self.alphabet))
+        nouvel_automate.ajouter_transitions_lot(transitions)
 
         return nouvel_automate
 
@@ -88,48 +399,128 @@ class Automate:
             complement.ajouter_etat(nom_etat, est_initial=etat.est_initial, est_final=not etat.est_final)
 
         # Copier les transitions
-        for t in self.transitions:
-            complement.ajouter_transition(t.source, t.symbole, t.destination)
+        complement.ajouter_transitions_lot((t.source, t.symbole, t.destination) for t in self.transitions)
 
         return complement
 
-    def determiniser(self):
-        new_automate = Automate(self.nom + "_deterministe")
-        etats_afn = self.etats
-        transitions_afn = self.transitions
+    def determiniser(self, progression=None):
+        """
+        Construction des sous-ensembles ; chaque état de l'AFD est nommé par ses états d'origine.
+        Un automate déjà déterministe (un seul état initial) est simplement copié, réduit comme
+        la construction à ses états accessibles.
+        progression(sous_ensembles_explores, None) est appelé régulièrement pendant le parcours.
+        """
+        if self._est_simple():
+            copie = Automate(self.nom + "_deterministe", alphabet=self.alphabet.copy())
+            accessibles = self.etats_accessibles()
+            for nom in accessibles:
+                etat = self.etats[nom]
+                copie.ajouter_etat(nom, est_initial=etat.est_initial, est_final=etat.est_final)
+            copie.ajouter_transitions_lot(
+                (nom, symbole, destination)
+                for nom in accessibles
+                for symbole, destinations in self.transitions_sortantes(nom).items()
+                for destination in destinations
+            )
+            return copie
+
+        masques, transitions, noms, finaux = self._determiniser_masques(progression)
+
+        # Les noms ne sont produits qu'à l'export : « {q0, q1} »
+        etiquettes = []
+        for masque in masques:
+            if progression is not None and len(etiquettes) % PAS_PROGRESSION == 0:
+                progression(len(masques), None)
+            etiquettes.append(self._etiquette_masque(masque, noms))
+        if progression is not None:
+            progression(len(masques), None)
+        sources, symboles, destinations = zip(*transitions) if transitions else ((), (), ())
+        return Automate.from_arrays(
+            etiquettes, [i for i, masque in enumerate(masques) if masque & finaux], 0,
+            sources, symboles, destinations,
+            nom=self.nom + "_deterministe", alphabet=self.alphabet - SYMBOLES_EPSILON
+        )
 
-        initiaux = [e.nom for e in etats_afn.values() if e.est_initial]
-        file = deque()
-        initial_set = frozenset(initiaux)
-        file.append(initial_set)
-        visited = {initial_set}
+    def _determiniser_masques(self, progression=None):
+        """
+        Construction des sous-ensembles sur des bitsets : l'état d'indice i de l'AFN est le
+        bit 1 << i, un sous-ensemble est un entier. Retourne (masques, transitions, noms, finaux)
+        où masques[0] est l'état initial et transitions liste les (id, symbole, id).
+        Les sous-ensembles vides ne sont pas représentés.
+        """
+        noms = list(self.etats)
+        indice = {nom: i for i, nom in enumerate(noms)}
+        alphabet = sorted(self.alphabet - SYMBOLES_EPSILON)
+
+        # fermetures[i] : masque de la ε-fermeture de l'état i, None sans ε-transitions
+        # (la fermeture de i est alors 1 << i, inutile de la stocker)
+        fermetures = None
+        if self.a_transitions_epsilon():
+            fermetures_noms = self._fermetures()
+            fermetures = [0] * len(noms)
+            for i, nom in enumerate(noms):
+                for membre in fermetures_noms[nom]:
+                    fermetures[i] |= 1 << indice[membre]
+
+        # lignes[i][c] : masque des successeurs (ε-fermés) de l'état i par alphabet[c], calculé
+        # au premier sous-ensemble atteint contenant i ; un masque fait jusqu'à n bits, seuls les
+        # états atteints en ont donc (les symboles absents partagent l'entier 0)
+        position = {symbole: c for c, symbole in enumerate(alphabet)}
+        lignes = [None] * len(noms)
+
+        finaux = 0
+        initial = 0
+        for i, nom in enumerate(noms):
+            if self.etats[nom].est_final:
+                finaux |= 1 << i
+            if self.etats[nom].est_initial:
+                initial |= fermetures[i] if fermetures is not None else 1 << i
+
+        ids = {initial: 0}
+        masques = [initial]
+        transitions = []
+        for courant, masque in enumerate(masques):  # la liste grandit pendant le parcours
+            if progression is not None and courant % PAS_PROGRESSION == 0:
+                progression(courant, None)
+            lignes_courantes = []
+            reste = masque
+            while reste:
+                bas = reste & -reste
+                reste ^= bas
+                i = bas.bit_length() - 1
+                ligne = lignes[i]
+                if ligne is None:
+                    ligne = lignes[i] = [0] * len(alphabet)
+                    for symbole, destinations in self._succ.get(noms[i], {}).items():
+                        c = position.get(symbole)
+                        if c is None:  # ε
+                            continue
+                        for destination in destinations:
+                            j = indice[destination]
+                            ligne[c] |= fermetures[j] if fermetures is not None else 1 << j
+                lignes_courantes.append(ligne)
+            for c, symbole in enumerate(alphabet):
+                suivant = 0
+                for ligne in lignes_courantes:
+                    suivant |= ligne[c]
+                if not suivant:
+                    continue
+                cible = ids.get(suivant)
+                if cible is None:
+                    cible = ids[suivant] = len(masques)
+                    masques.append(suivant)
+                transitions.append((courant, symbole, cible))
 
-        new_automate.ajouter_etat(str(initial_set), est_initial=True,
-                                  est_final=any(etats_afn[s].est_final for s in initial_set))
+        return masques, transitions, noms, finaux
 
-        while file:
-            current_set = file.popleft()
-            for symbole in self.alphabet:
-                next_set = set()
-                for etat in current_set:
-                    for t in transitions_afn:
-                        if t.source == etat and t.symbole == symbole:
-                            next_set.add(t.destination)
-                if next_set:
-                    next_frozen = frozenset(next_set)
-                    if next_frozen not in visited:
-                        visited.add(next_frozen)
-                        new_automate.ajouter_etat(str(next_frozen),
-                                                  est_initial=False,
-                                                  est_final=any(etats_afn[s].est_final for s in next_frozen))
-                        file.append(next_frozen)
-                    new_automate.ajouter_transition(str(current_set), symbole, str(next_frozen))
-
-        return new_automate
-
-    def ajouter_transition(self, source, symbole, destination):
-        self.transitions.append(Transition(source, symbole, destination))
-        self.alphabet.add(symbole)
+    @staticmethod
+    def _etiquette_masque(masque, noms):
+        membres = []
+        while masque:  # un tour par bit à 1, sans décaler tout le masque à chaque bit
+            bas = masque & -masque
+            membres.append(noms[bas.bit_length() - 1])
+            masque ^= bas
+        return "{" + ", ".join(sorted(membres)) + "}"
 
     def get_etat_initial(self):
         for etat in self.etats.values():
@@ -141,15 +532,14 @@ class Automate:
         return self.etats[etat_nom].est_final if etat_nom in self.etats else False
 
     def transition(self, etat_nom, symbole):
-        for t in self.transitions:
-            if t.source == etat_nom and t.symbole == symbole:
-                return t.destination
+        for destination in self.successeurs(etat_nom, symbole):
+            return destination
         return None
 
     def est_deterministe(self):
         # Pas de transitions epsilon autorisées
         for t in self.transitions:
-            if t.symbole == 'ε' or t.symbole == '':
+            if t.symbole in SYMBOLES_EPSILON:
                 return False
 
         # Vérifier qu'il n'y a pas plusieurs transitions pour un même état + symbole
@@ -163,157 +553,149 @@ class Automate:
 
         return True
 
-    def to_graphviz(self, filename="automate"):
-        """Génère une représentation graphique de l'automate avec Graphviz"""
-        dot = graphviz.Digraph(format='png')
-        dot.attr(rankdir='LR')
+    def source_dot(self):
+        """
+        Texte DOT de l'automate. États et transitions sont triés : deux automates de même
+        hash structurel ont la même source, donc la même image.
+        """
+        def citer(texte):
+            return '"' + str(texte).replace("\\", "\\\\").replace('"', '\\"') + '"'
 
-        # Ajouter les états
-        for etat in self.etats.values():
+        lignes = ["digraph {", "\trankdir=LR"]
+        etats = sorted(self.etats.values(), key=lambda e: str(e.nom))
+        for etat in etats:
             shape = "doublecircle" if etat.est_final else "circle"
-            dot.node(etat.nom, etat.nom, shape=shape)
+            lignes.append(f"\t{citer(etat.nom)} [label={citer(etat.nom)} shape={shape}]")
 
-        # Ajouter les états initiaux
-        for etat in self.etats.values():
-            if etat.est_initial:
-                dot.node("init", label="", shape="none")
-                dot.edge("init", etat.nom)
+        # Flèche entrante sans origine vers les états initiaux
+        initiaux = [etat for etat in etats if etat.est_initial]
+        if initiaux:
+            lignes.append('\tinit [label="" shape=none]')
+        for etat in initiaux:
+            lignes.append(f"\tinit -> {citer(etat.nom)}")
 
-        # Ajouter les transitions
-        for t in self.transitions:
-            dot.edge(t.source, t.destination, label=t.symbole)
+        aretes = sorted(
+            (str(source), str(symbole), str(destination))
+            for source, sortantes in self._succ.items()
+            for symbole, destinations in sortantes.items()
+            for destination in destinations
+        )
+        for source, symbole, destination in aretes:
+            lignes.append(f"\t{citer(source)} -> {citer(destination)} [label={citer(symbole)}]")
+        lignes.append("}")
+        return "\n".join(lignes) + "\n"
 
-        # Générer le fichier
+    def to_graphviz(self, filename="automate"):
+        """Génère une représentation graphique de l'automate avec Graphviz"""
+        import graphviz  # importé à la demande : le modèle reste utilisable sans Graphviz
+        dot = graphviz.Source(self.source_dot(), format='png')
         dot.render(filename=filename, cleanup=True)
         return dot
 
     def visualiser(self, chemin_sortie=None):
-        """Génère et sauvegarde une visualisation de l'automate"""
+        """
+        Génère une image PNG de l'automate et retourne son chemin : chemin_sortie + '.png',
+        ou un fichier du dossier temporaire sans chemin_sortie.
+        """
         try:
-            dot = self.to_graphviz()
-            if chemin_sortie:
-                # Sauvegarder au format PNG
-                dot.render(chemin_sortie, format='png', cleanup=True)
-                return chemin_sortie + '.png'
-            else:
-                # Sauvegarder dans un dossier temporaire avec un nom unique
-                import tempfile
-                import os
-                temp_dir = tempfile.gettempdir()
-                temp_path = os.path.join(temp_dir, f'automate_{self.nom}_{id(self)}')
-                dot.render(temp_path, format='png', cleanup=True)
-                return temp_path + '.png'
+            import graphviz  # importé à la demande : le modèle reste utilisable sans Graphviz
+            if not chemin_sortie:
+                chemin_sortie = os.path.join(tempfile.gettempdir(), f"automate_{self.nom}_{id(self)}")
+            graphviz.Source(self.source_dot()).render(chemin_sortie, format='png', cleanup=True)
+            return chemin_sortie + '.png'
         except Exception as e:
             print(f"Erreur lors de la visualisation : {str(e)}")
             return None
 
     def union(self, autre):
-        from collections import deque
-
-        alphabet_union = self.alphabet.union(autre.alphabet)
-        etat_initial = (self.get_etat_initial(), autre.get_etat_initial())
-        etats = {}
-        transitions = []
-        file = deque()
-        file.append(etat_initial)
-
-        etats[etat_initial] = {
-            'est_initial': True,
-            'est_final': self.est_final(etat_initial[0]) or autre.est_final(etat_initial[1])
-        }
-
-        while file:
-            etat_courant = file.popleft()
-            for symbole in alphabet_union:
-                etat_suivant_1 = self.transition(etat_courant[0], symbole)
-                etat_suivant_2 = autre.transition(etat_courant[1], symbole)
-
-                if etat_suivant_1 is None or etat_suivant_2 is None:
-                    continue
-
-                etat_suivant = (etat_suivant_1, etat_suivant_2)
-
-                if etat_suivant not in etats:
-                    est_final = self.est_final(etat_suivant_1) or autre.est_final(etat_suivant_2)
-                    etats[etat_suivant] = {'est_initial': False, 'est_final': est_final}
-                    file.append(etat_suivant)
-
-                transitions.append((etat_courant, symbole, etat_suivant))
-
-        etats_noms = {etat: f"{etat[0]}_{etat[1]}" for etat in etats}
-        transitions_nouvelles = [(etats_noms[src], symb, etats_noms[dest]) for (src, symb, dest) in transitions]
-        etats_finals_dict = {etats_noms[etat]: props for etat, props in etats.items()}
-
-        nouvel_automate = Automate(f"Union_{self.nom}_{autre.nom}")
-        nouvel_automate.alphabet = alphabet_union
-        for nom, props in etats_finals_dict.items():
-            nouvel_automate.ajouter_etat(nom, props['est_initial'], props['est_final'])
-        for src, symb, dest in transitions_nouvelles:
-            nouvel_automate.ajouter_transition(src, symb, dest)
-
-        return nouvel_automate
+        return self._produit(autre, f"Union_{self.nom}_{autre.nom}", union=True)
 
     def intersection(self, autre):
         if self.alphabet != autre.alphabet:
             raise ValueError("Les alphabets des deux automates doivent être identiques pour l'intersection.")
+        return self._produit(autre, f"Intersection_{self.nom}_{autre.nom}", union=False)
 
-        nom_intersection = f"Intersection_{self.nom}_{autre.nom}"
-        automate_inter = Automate(nom_intersection)
-        automate_inter.alphabet = self.alphabet
-
-        # Création des états du produit cartésien
-        for (nom1, etat1) in self.etats.items():
-            for (nom2, etat2) in autre.etats.items():
-                nouveau_nom = f"{nom1}_{nom2}"
-                est_initial = etat1.est_initial and etat2.est_initial
-                est_final = etat1.est_final and etat2.est_final
-                automate_inter.ajouter_etat(nouveau_nom, est_initial, est_final)
-
-        # Ajout des transitions
-        for t1 in self.transitions:
-            for t2 in autre.transitions:
-                if t1.symbole == t2.symbole:
-                    source = f"{t1.source}_{t2.source}"
-                    symbole = t1.symbole
-                    destination = f"{t1.destination}_{t2.destination}"
-                    automate_inter.ajouter_transition(source, symbole, destination)
-
-        # Définir l'état initial (le premier état marqué initial)
-        for etat in automate_inter.etats.values():
-            if etat.est_initial:
-                automate_inter.etat_initial = etat.nom
-                break
-
-        return automate_inter
-
-    def complement(self):
-        # Vérifier que l'automate est déterministe et complet
-        if not self.est_deterministe():
-            raise Exception("L'automate doit être déterministe pour calculer le complément.")
-        if not self.est_complet():
-            raise Exception("L'automate doit être complet pour calculer le complément.")
-
-        # Création d'un nouvel automate complémentaire avec le nom
-        complement = Automate(self.nom + "_complement")
-
-        # Copier l'alphabet
-        complement.alphabet = self.alphabet.copy()
-
-        # Copier les états en inversant leur propriété 'est_final'
-        complement.etats = {}
-        for nom_etat, etat in self.etats.items():
-            nouvel_etat = Etat(nom=etat.nom, est_initial=etat.est_initial, est_final=not etat.est_final)
-            complement.etats[nom_etat] = nouvel_etat
-
-        # Copier les transitions telles quelles (même structure)
-        complement.transitions = [t for t in self.transitions]
+    def _produit(self, autre, nom, union):
+        """
+        Construit l'automate produit en ne parcourant que les paires accessibles depuis
+        la paire initiale. Pour l'union, None désigne un côté sans transition (puits implicite).
+        """
+        if self.a_transitions_epsilon():
+            return self.supprimer_epsilon()._produit(autre, nom, union)
+        if autre.a_transitions_epsilon():
+            return self._produit(autre.supprimer_epsilon(), nom, union)
+
+        initiaux1 = [e.nom for e in self.etats.values() if e.est_initial]
+        initiaux2 = [e.nom for e in autre.etats.values() if e.est_initial]
+        if union:
+            initiaux1, initiaux2 = initiaux1 or [None], initiaux2 or [None]
+
+        paires = []  # identifiant entier -> (état de self, état de autre)
+        ids = {}
+        transitions = []  # (id source, symbole, id destination)
+
+        def identifiant(paire):
+            if paire not in ids:
+                ids[paire] = len(paires)
+                paires.append(paire)
+            return ids[paire]
+
+        initiaux = [identifiant(p) for p in product(initiaux1, initiaux2) if p != (None, None)]
+
+        for courant, (etat1, etat2) in enumerate(paires):  # la liste grandit pendant le parcours
+            sortantes1 = self.transitions_sortantes(etat1) if etat1 is not None else {}
+            sortantes2 = autre.transitions_sortantes(etat2) if etat2 is not None else {}
+            if union:
+                symboles = sortantes1.keys() | sortantes2.keys()
+            else:
+                symboles = sortantes1.keys() & sortantes2.keys()
+            for symbole in symboles:
+                destinations1 = sortantes1.get(symbole) or [None]
+                destinations2 = sortantes2.get(symbole) or [None]
+                for dest1 in destinations1:
+                    for dest2 in destinations2:
+                        transitions.append((courant, symbole, identifiant((dest1, dest2))))
+
+        # Les noms ne sont produits qu'ici, une fois les paires accessibles connues
+        noms = self._nommer_paires(paires)
+        finaux = []
+        for i, (etat1, etat2) in enumerate(paires):
+            final1, final2 = self.est_final(etat1), autre.est_final(etat2)
+            if (final1 or final2) if union else (final1 and final2):
+                finaux.append(i)
+        sources, symboles, destinations = zip(*transitions) if transitions else ((), (), ())
+        return Automate.from_arrays(
+            noms, finaux, initiaux, sources, symboles, destinations, nom=nom,
+            alphabet=self.alphabet | autre.alphabet if union else self.alphabet
+        )
 
-        return complement
+    @staticmethod
+    def _nommer_paires(paires):
+        """Nomme chaque paire « a_b » (∅ pour un côté absent) en évitant les collisions"""
+        noms, pris = [], set()
+        for i, (etat1, etat2) in enumerate(paires):
+            nom = f"{'∅' if etat1 is None else etat1}_{'∅' if etat2 is None else etat2}"
+            if nom in pris:
+                nom = f"{nom}#{i}"
+            pris.add(nom)
+            noms.append(nom)
+        return noms
 
     def etats_finaux(self):
         return [etat.nom for etat in self.etats.values() if etat.est_final]
 
     def reconnait(self, mot):
+        if not self._est_simple():
+            # Simulation de l'AFN sur les ensembles d'états (ε-fermetures en cache)
+            ensemble = self._ensemble_initial()
+            for symbole in mot:
+                if symbole not in self.alphabet:
+                    return False
+                ensemble = self._etape(ensemble, symbole)
+                if not ensemble:
+                    return False
+            return any(self.est_final(e) for e in ensemble)
+
         etat_courant = self.get_etat_initial()
         if etat_courant is None:
             return False
@@ -321,127 +703,341 @@ class Automate:
         for symbole in mot:
             if symbole not in self.alphabet:
                 return False  # symbole inconnu
-            trouve = False
-            for t in self.transitions:
-                if t.source == etat_courant and t.symbole == symbole:
-                    etat_courant = t.destination
-                    trouve = True
-                    break
-            if not trouve:
+            etat_courant = self.transition(etat_courant, symbole)
+            if etat_courant is None:
                 return False
-        return etat_courant in self.etats_finaux()
+        return self.est_final(etat_courant)
+
+    def compile(self):
+        """Fige l'automate déterministe en un CompiledDFA pour tester de nombreux mots"""
+        return CompiledDFA.depuis_automate(self)
 
-    def est_equivalent(self, autre_automate, longueur_max):
+    def reconnait_lot(self, mots):
+        """Teste un lot de mots en une seule passe vectorisée sur l'automate compilé"""
+        # Plusieurs états initiaux : l'automate compilé n'en garde qu'un, il faut déterminiser
+        automate = self if self._est_simple() else self.determiniser()
+        return automate.compile().accepts_many(mots)
+
+    def est_equivalent(self, autre_automate, longueur_max=None, progression=None):
         """
-        Vérifie si deux automates sont équivalents en testant tous les mots possibles
-        jusqu'à une longueur donnée.
+        Vérifie si deux automates reconnaissent le même langage.
+        Si longueur_max est donnée, seuls les mots de longueur <= longueur_max sont comparés.
         """
-        from itertools import product
+        return self.mot_distinguant(autre_automate, longueur_max, progression) is None
 
-        if self.alphabet != autre_automate.alphabet:
-            return False
+    def mot_distinguant(self, autre_automate, longueur_max=None, progression=None):
+        """
+        Retourne un plus court mot reconnu par un seul des deux automates, ou None
+        s'ils sont équivalents (algorithme de Hopcroft-Karp avec union-find sur les
+        paires d'ensembles d'états, déterminisés à la volée).
+        progression(paires_explorees, None) est appelé régulièrement.
+        """
+        alphabet = sorted((self.alphabet | autre_automate.alphabet) - SYMBOLES_EPSILON)
+        automates = (self, autre_automate)
 
-        alphabet = list(self.alphabet)
-        for n in range(longueur_max + 1):
-            for p in product(alphabet, repeat=n):
-                mot = "".join(p)
-                if self.reconnait(mot) != autre_automate.reconnait(mot):
-                    return False
-        return True
+        parent = {}
 
-    def ajouter_transition(self, source, symbole, destination):
-        self.ajouter_etat(source)
-        self.ajouter_etat(destination)
-        self.transitions.append(Transition(source, symbole, destination))
-        self.alphabet.add(symbole)
+        def representant(noeud):
+            parent.setdefault(noeud, noeud)
+            while parent[noeud] != noeud:
+                parent[noeud] = parent[parent[noeud]]
+                noeud = parent[noeud]
+            return noeud
 
-    def generer_mots_acceptes(self, longueur_max):
-        """
-        Génère tous les mots acceptés par l'automate jusqu'à une longueur maximale donnée.
-        """
-        mots_acceptes = set()
-        initiaux = [e.nom for e in self.etats.values() if e.est_initial]
-        if not initiaux:
-            return list(mots_acceptes)
+        def est_final(cote, ensemble):
+            return any(automates[cote].est_final(e) for e in ensemble)
 
-        file = deque()
-        for etat in initiaux:
-            file.append((etat, ""))
+        depart = (self._ensemble_initial(), autre_automate._ensemble_initial())
+        precedent = {depart: None}  # paire -> (paire précédente, symbole)
+        file = deque([(depart, 0)])
+        parent[representant((1, depart[1]))] = representant((0, depart[0]))
 
+        explorees = 0
         while file:
-            etat_courant, mot = file.popleft()
-
-            if len(mot) > longueur_max:
+            paire, longueur = file.popleft()
+            if progression is not None and explorees % PAS_PROGRESSION == 0:
+                progression(explorees, None)
+            explorees += 1
+            if est_final(0, paire[0]) != est_final(1, paire[1]):
+                mot = []
+                while precedent[paire] is not None:
+                    paire, symbole = precedent[paire]
+                    mot.append(symbole)
+                return "".join(reversed(mot))
+            if longueur_max is not None and longueur >= longueur_max:
                 continue
 
-            if self.etats[etat_courant].est_final:
-                mots_acceptes.add(mot)
+            for symbole in alphabet:
+                suivante = (self._etape(paire[0], symbole), autre_automate._etape(paire[1], symbole))
+                r1, r2 = representant((0, suivante[0])), representant((1, suivante[1]))
+                if r1 == r2:
+                    continue
+                parent[r2] = r1
+                precedent.setdefault(suivante, (paire, symbole))
+                file.append((suivante, longueur + 1))
+
+        return None
 
-            for t in self.transitions:
-                if t.source == etat_courant:
-                    file.append((t.destination, mot + t.symbole))
+    def generer_mots_acceptes(self, longueur_max, progression=None):
+        """
+        Génère tous les mots acceptés par l'automate jusqu'à une longueur maximale donnée,
+        triés par longueur puis par ordre lexicographique.
+        """
+        return list(self.iter_mots_acceptes(longueur_max, progression=progression))
 
-        return sorted(mots_acceptes)
+    def iter_mots_acceptes(self, longueur_max, limit=None, progression=None):
+        """
+        Produit paresseusement les mots acceptés de longueur <= longueur_max, par longueur
+        puis par ordre lexicographique. Les préfixes qui ne peuvent plus atteindre un état
+        final en exactement le nombre de symboles restant sont élagués.
+        progression(mots_produits, None) est appelé à chaque longueur et régulièrement pendant le parcours.
+        """
+        if limit is not None and limit <= 0:
+            return
+        alphabet = sorted(self.alphabet - SYMBOLES_EPSILON)
+        initial = self._ensemble_initial()
+        etapes = {}  # cache (ensemble, symbole) -> ensemble suivant
+
+        # couches[k] : états depuis lesquels un état final est atteignable en exactement k symboles
+        # Chaque couche ne dépend que de la précédente : dès qu'une couche se répète, la suite est
+        # périodique et les couches suivantes ne sont plus stockées.
+        couches = [self._cofermer(e.nom for e in self.etats.values() if e.est_final)]
+        vues = {couches[0]: 0}
+        periode = None
+
+        def couche(k):
+            nonlocal periode
+            while periode is None and len(couches) <= k:
+                suivante = self._cofermer(
+                    source
+                    for etat in couches[-1]
+                    for symbole, sources in self._index_pred().get(etat, {}).items()
+                    if symbole not in SYMBOLES_EPSILON
+                    for source in sources
+                )
+                if suivante in vues:
+                    periode = len(couches) - vues[suivante]
+                else:
+                    vues[suivante] = len(couches)
+                    couches.append(suivante)
+            if k >= len(couches):
+                debut = len(couches) - periode
+                k = debut + (k - debut) % periode
+            return couches[k]
+
+        produits = 0
+        pas = 0
+        sterile = None  # vrai si aucune couche du cycle n'est atteignable depuis l'état initial
+        for longueur in range(longueur_max + 1):
+            if progression is not None:
+                progression(produits, None)
+            if initial.isdisjoint(couche(longueur)):
+                if periode is not None and longueur >= len(couches) - periode:
+                    if sterile is None:
+                        sterile = all(initial.isdisjoint(c) for c in couches[len(couches) - periode:])
+                    if sterile:
+                        return  # plus aucun mot accepté, quelle que soit la longueur
+                continue
+            # Parcours en profondeur dans l'ordre de l'alphabet : pile de (ensemble, prochain symbole)
+            chemin = []
+            pile = [(initial, 0)]
+            while pile:
+                pas += 1
+                if progression is not None and pas % PAS_PROGRESSION == 0:
+                    progression(produits, None)
+                ensemble, k = pile[-1]
+                profondeur = len(pile) - 1
+                if profondeur == longueur or k == len(alphabet):
+                    if profondeur == longueur:
+                        yield "".join(chemin)
+                        produits += 1
+                        if limit is not None and produits >= limit:
+                            return
+                    pile.pop()
+                    if pile:
+                        chemin.pop()
+                    continue
+                pile[-1] = (ensemble, k + 1)
+                symbole = alphabet[k]
+                cle = (ensemble, symbole)
+                suivant = etapes.get(cle)
+                if suivant is None:
+                    suivant = etapes[cle] = self._etape(ensemble, symbole)
+                if not suivant.isdisjoint(couche(longueur - profondeur - 1)):
+                    chemin.append(symbole)
+                    pile.append((suivant, 0))
+
+    def compter_mots(self, n, progression=None):
+        """Nombre de mots de longueur exactement n acceptés par l'automate"""
+        return self._compter(n, cumul=False, progression=progression)
+
+    def compter_mots_jusqua(self, n, progression=None):
+        """Nombre de mots de longueur <= n acceptés par l'automate"""
+        return self._compter(n, cumul=True, progression=progression)
+
+    def _compter(self, n, cumul, progression=None):
+        if n < 0:
+            return 0
+        matrice, finaux = self._matrice_comptage(progression)
+        if not matrice:
+            return 0
+        taille = len(matrice)
+        nb_arcs = sum(len(ligne) for ligne in matrice)
+
+        # Programmation dynamique en O(n·|T|), ou exponentiation rapide en
+        # O(|Q|^3·log n) quand n est grand devant la taille de l'automate
+        if n * nb_arcs <= 2 * taille ** 3 * n.bit_length():
+            vecteur = {0: 1}  # l'état 0 est l'état initial
+            total = sum(c for q, c in vecteur.items() if q in finaux)
+            for k in range(n):
+                if progression is not None and k % PAS_PROGRESSION == 0:
+                    progression(k, n)
+                suivant = {}
+                for q, c in vecteur.items():
+                    for d, multiplicite in matrice[q].items():
+                        suivant[d] = suivant.get(d, 0) + c * multiplicite
+                vecteur = suivant
+                if cumul:
+                    total += sum(c for q, c in vecteur.items() if q in finaux)
+            return total if cumul else sum(c for q, c in vecteur.items() if q in finaux)
+
+        dense = [[ligne.get(j, 0) for j in range(taille)] for ligne in matrice]
+        if cumul:
+            # Matrice augmentée [[M, f], [0, 1]] : la dernière colonne accumule les mots acceptés
+            for q, ligne in enumerate(dense):
+                ligne.append(1 if q in finaux else 0)
+            dense.append([0] * taille + [1])
+            vecteur = [1] + [0] * taille
+            vecteur = self._vecteur_fois_puissance(vecteur, dense, n + 1, progression)
+            return vecteur[-1]
+        vecteur = self._vecteur_fois_puissance([1] + [0] * (taille - 1), dense, n, progression)
+        return sum(vecteur[q] for q in finaux)
 
-    def mots_rejetes(self, longueur_max):
+    @staticmethod
+    def _vecteur_fois_puissance(vecteur, matrice, n, progression=None):
+        """
+        Calcule vecteur · matrice^n par exponentiation rapide, en entiers exacts.
+        progression(etapes_faites, etapes_totales) est appelé à chaque ligne de chaque produit :
+        avec de grands n, un seul carré de matrice peut prendre des secondes.
+        """
+        taille = len(matrice)
+        total = 2 * n.bit_length()
+        etape = 0
+
+        def signaler():
+            if progression is not None:
+                progression(etape, total)
+
+        def produit(a, b):
+            colonnes = list(zip(*b))
+            resultat = []
+            for ligne in a:
+                signaler()
+                resultat.append([sum(x * y for x, y in zip(ligne, colonne)) for colonne in colonnes])
+            return resultat
+
+        while n:
+            if n & 1:
+                signaler()
+                vecteur = [sum(vecteur[i] * matrice[i][j] for i in range(taille) if vecteur[i])
+                           for j in range(taille)]
+            etape += 1
+            n >>= 1
+            if n:
+                matrice = produit(matrice, matrice)
+            etape += 1
+        return vecteur
+
+    def _matrice_comptage(self, progression=None):
+        """
+        Automate des sous-ensembles réduit aux états accessibles et
+        co-accessibles, sous forme de matrice creuse : matrice[i] = {j: nombre de symboles i -> j}.
+        L'état 0 est l'état initial ; retourne ([], set()) si le langage est vide.
+        Un automate déjà déterministe est lu directement, sans construction des sous-ensembles.
+        """
+        if self._est_simple():
+            noms = self.etats_accessibles()
+            if not noms:
+                return [], set()
+            indice = {nom: i for i, nom in enumerate(noms)}  # l'état initial reçoit l'indice 0
+            arcs = [
+                (indice[nom], indice[destination])
+                for nom in noms
+                for destinations in self._succ.get(nom, {}).values()
+                for destination in destinations
+            ]
+            sont_finaux = [self.etats[nom].est_final for nom in noms]
+        else:
+            masques, transitions, _, masque_finaux = self._determiniser_masques(progression)
+            arcs = [(i, j) for i, _, j in transitions]
+            sont_finaux = [bool(masque & masque_finaux) for masque in masques]
+
+        # Co-accessibilité : parcours arrière depuis les ensembles finaux
+        predecesseurs = {}
+        for i, j in arcs:
+            predecesseurs.setdefault(j, []).append(i)
+        utiles = [i for i, final in enumerate(sont_finaux) if final]
+        vus = set(utiles)
+        for j in utiles:
+            for i in predecesseurs.get(j, ()):
+                if i not in vus:
+                    vus.add(i)
+                    utiles.append(i)
+        if 0 not in vus:
+            return [], set()
+
+        renumerotation = {0: 0}
+        for i in sorted(vus - {0}):
+            renumerotation[i] = len(renumerotation)
+        matrice = [{} for _ in renumerotation]
+        for i, j in arcs:
+            if i in vus and j in vus:
+                ligne = matrice[renumerotation[i]]
+                ligne[renumerotation[j]] = ligne.get(renumerotation[j], 0) + 1
+        finaux = {renumerotation[i] for i in vus if sont_finaux[i]}
+        return matrice, finaux
+
+    def mots_rejetes(self, longueur_max, progression=None):
         """
         Retourne tous les mots sur l'alphabet de l'automate de longueur <= longueur_max
         qui ne sont pas acceptés.
+        progression(mots_enumeres, nombre_total_de_mots) est appelé régulièrement.
         """
         if not self.alphabet:
             return []
 
+        total = sum(len(self.alphabet) ** l for l in range(longueur_max + 1))
         tous_les_mots = set()
         for l in range(longueur_max + 1):
             for mot in product(self.alphabet, repeat=l):
+                if progression is not None and len(tous_les_mots) % PAS_PROGRESSION == 0:
+                    progression(len(tous_les_mots), total)
                 tous_les_mots.add("".join(mot))
 
-        mots_acceptes = set(self.generer_mots_acceptes(longueur_max))
+        mots_acceptes = set(self.generer_mots_acceptes(longueur_max, progression))
         return sorted(
             [mot for mot in tous_les_mots - mots_acceptes if mot != ""],
             key=lambda x: (len(x), x)
         )
 
-    def generer_mots_acceptes(self, longueur_max):
-        """
-        Génère tous les mots acceptés par l'automate jusqu'à une longueur maximale donnée.
-        """
-        mots_acceptes = set()
-
-        # Vérifie qu'il existe au moins un état initial
-        initiaux = [e.nom for e in self.etats.values() if e.est_initial]
-        if not initiaux:
-            return list(mots_acceptes)
-
-        file = deque()
-        # Chaque élément de la file contient : (état courant, mot formé jusqu'ici)
-        for etat in initiaux:
-            file.append((etat, ""))
-
-        while file:
-            etat_courant, mot = file.popleft()
-
-            if len(mot) > longueur_max:
-                continue
-
-            if self.etats[etat_courant].est_final:
-                mots_acceptes.add(mot)
-
-            for t in self.transitions:
-                if t.source == etat_courant:
-                    file.append((t.destination, mot + t.symbole))
-
-        return sorted(mots_acceptes)
-
     def supprimer_etat(self, nom):
         if nom in self.etats:
             del self.etats[nom]
+            self._caches.clear()
+            for symbole, destinations in list(self._succ.get(nom, {}).items()):
+                for destination in list(destinations):
+                    self._desindexer(nom, symbole, destination)
+            for symbole, sources in list(self._index_pred().get(nom, {}).items()):
+                for source in list(sources):
+                    self._desindexer(source, symbole, nom)
             self.transitions = [
                 t for t in self.transitions
                 if t.source != nom and t.destination != nom
             ]
 
     def supprimer_transition(self, source, symbole, destination):
+        self._desindexer(source, symbole, destination)
+        self._caches.clear()
         self.transitions = [
             t for t in self.transitions
             if not (t.source == source and t.symbole == symbole and t.destination == destination)
@@ -466,79 +1062,308 @@ class Automate:
         a = Automate(data["nom"])
         for e in data["etats"]:
             a.ajouter_etat(e["nom"], e["est_initial"], e["est_final"])
-        for t in data["transitions"]:
-            a.ajouter_transition(t["source"], t["symbole"], t["destination"])
+        a.ajouter_transitions_lot((t["source"], t["symbole"], t["destination"]) for t in data["transitions"])
+        return a
+
+    @staticmethod
+    def load_json_stream(chemin, progression=None):
+        """
+        Charge un fichier JSON (format de to_dict) élément par élément, sans le lire en entier.
+        progression(octets_lus, taille_totale) est appelé après chaque bloc lu.
+        """
+        a = Automate("")
+        lot = []
+        with open(chemin, "r", encoding="utf-8") as f, _sans_ramasse_miettes():
+            for cle, valeur in json_flux.iterer_document(f, progression):
+                if cle == "etat":
+                    etat = a.etats.get(valeur["nom"])
+                    if etat is None:
+                        a.etats[valeur["nom"]] = Etat(valeur["nom"], valeur["est_initial"], valeur["est_final"])
+                    else:  # état déjà créé par une transition lue plus tôt
+                        etat.est_initial, etat.est_final = valeur["est_initial"], valeur["est_final"]
+                    if valeur["est_initial"]:
+                        a.etat_initial = valeur["nom"]
+                elif cle == "transition":
+                    lot.append((valeur["source"], valeur["symbole"], valeur["destination"]))
+                    if len(lot) >= json_flux.TAILLE_LOT:
+                        a.ajouter_transitions_lot(lot)
+                        lot = []
+                elif cle == "nom":
+                    a.nom = valeur
+            a.ajouter_transitions_lot(lot)
         return a
 
-    def est_minimal(self):
+    def hash_structurel(self):
+        """
+        Empreinte SHA-256 des états, de l'alphabet et des transitions (noms compris),
+        indépendante de l'ordre de création ; le nom de l'automate n'en fait pas partie.
+        """
+        contenu = [
+            sorted([str(e.nom), e.est_initial, e.est_final] for e in self.etats.values()),
+            sorted(map(str, self.alphabet)),
+            sorted(
+                [str(source), str(symbole), str(destination)]
+                for source, sortantes in self._succ.items()
+                for symbole, destinations in sortantes.items()
+                for destination in destinations
+            ),
+        ]
+        return hashlib.sha256(json.dumps(contenu, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def to_bytes(self):
+        return format_binaire.ecrire(self)
+
+    @staticmethod
+    def from_bytes(donnees):
+        return format_binaire.lire(donnees)
+
+    def save_binary(self, chemin):
+        format_binaire.sauvegarder(self, chemin)
+
+    @staticmethod
+    def load_binary(chemin):
+        return format_binaire.charger(chemin)
+
+    def sauvegarder(self, chemin):
+        """Enregistre l'automate au format binaire ou JSON selon l'extension du fichier"""
+        if chemin.lower().endswith(format_binaire.EXTENSION_BINAIRE):
+            self.save_binary(chemin)
+        else:
+            with open(chemin, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    @staticmethod
+    def charger(chemin):
+        """
+        Charge un automate au format binaire ou JSON selon l'extension du fichier ;
+        les fichiers JSON de plus de json_flux.SEUIL_FLUX octets sont lus en flux.
+        """
+        if chemin.lower().endswith(format_binaire.EXTENSION_BINAIRE):
+            return Automate.load_binary(chemin)
+        if os.path.getsize(chemin) > json_flux.SEUIL_FLUX:
+            return Automate.load_json_stream(chemin)
+        with open(chemin, "r", encoding="utf-8") as f:
+            return Automate.from_dict(json.load(f))
+
+    def est_minimal(self, progression=None):
         """Vérifie si l'automate est minimal en comparant avec sa version minimisée."""
-        automate_min = self.minimiser()
+        automate_min = self.minimiser(progression)
         return len(self.etats) == len(automate_min.etats)
 
-    def minimiser(self):
-        """Minimise l'automate en utilisant l'algorithme de Hopcroft"""
+    def etats_accessibles(self):
+        """Retourne la liste des états atteignables depuis les états initiaux (ordre BFS)"""
+        accessibles = [e.nom for e in self.etats.values() if e.est_initial]
+        vus = set(accessibles)
+        for etat in accessibles:  # la liste grandit pendant le parcours
+            for destinations in self.transitions_sortantes(etat).values():
+                for destination in destinations:
+                    if destination not in vus:
+                        vus.add(destination)
+                        accessibles.append(destination)
+        return accessibles
+
+    def minimiser(self, progression=None):
+        """
+        Minimise l'automate en utilisant l'algorithme de Hopcroft (O(|Σ|·n·log n)).
+        progression(separateurs_traites, None) est appelé régulièrement pendant le raffinement.
+        """
         if not self.est_deterministe():
             raise ValueError("L'automate doit être déterministe pour être minimisé.")
 
-        # Initialisation des partitions
-        partitions = []
-        finaux = {e.nom for e in self.etats.values() if e.est_final}
-        non_finaux = set(self.etats.keys()) - finaux
-
-        if finaux:
-            partitions.append(finaux)
-        if non_finaux:
-            partitions.append(non_finaux)
-
-        # Raffinement des partitions
-        while True:
-            nouvelles_partitions = []
-            for partition in partitions:
-                if len(partition) == 1:
-                    nouvelles_partitions.append(partition)
+        # États accessibles codés par des entiers ; l'indice n est un puits virtuel
+        # qui reçoit les transitions manquantes. Il démarre avec les états non finaux,
+        # si bien que les états morts explicites lui sont équivalents.
+        noms = self.etats_accessibles()
+        indice = {nom: i for i, nom in enumerate(noms)}
+        n = len(noms)
+        puits = n
+        symboles = sorted(self.alphabet)
+
+        # Index inverse : inverse[c][q] = états p tels que δ(p, c) = q
+        inverse = []
+        for symbole in symboles:
+            inv = {puits: [puits]}
+            for q, nom in enumerate(noms):
+                sources = [indice[p] for p in self.predecesseurs(nom, symbole) if p in indice]
+                if sources:
+                    inv[q] = sources
+                if not self.successeurs(nom, symbole):
+                    inv[puits].append(q)
+            inverse.append(inv)
+
+        # Partition initiale : finaux, non finaux (puits compris). Chaque bloc occupe un
+        # segment [debut, fin) du tableau elements ; les états marqués lors d'un
+        # découpage sont ramenés en tête de leur segment.
+        finaux = [q for q, nom in enumerate(noms) if self.etats[nom].est_final]
+        non_finaux = [q for q, nom in enumerate(noms) if not self.etats[nom].est_final] + [puits]
+        elements, debut, fin = [], [], []
+        for groupe in (finaux, non_finaux):
+            if groupe:
+                debut.append(len(elements))
+                elements.extend(groupe)
+                fin.append(len(elements))
+        position = [0] * (n + 1)
+        bloc_de = [0] * (n + 1)
+        for b in range(len(debut)):
+            for k in range(debut[b], fin[b]):
+                position[elements[k]] = k
+                bloc_de[elements[k]] = b
+        marques = [0] * len(debut)
+
+        # Tous les blocs initiaux sauf le plus grand servent de séparateurs
+        plus_grand = max(range(len(debut)), key=lambda b: fin[b] - debut[b])
+        a_traiter = [(b, c) for b in range(len(debut)) if b != plus_grand for c in range(len(symboles))]
+        en_attente = set(a_traiter)
+
+        traites = 0
+        while a_traiter:
+            if progression is not None and traites % PAS_PROGRESSION == 0:
+                progression(traites, None)
+            traites += 1
+            separateur = a_traiter.pop()
+            en_attente.discard(separateur)
+            bloc, c = separateur
+            inv = inverse[c]
+
+            # Marquer les prédécesseurs des états du bloc séparateur
+            touches = []
+            for q in elements[debut[bloc]:fin[bloc]]:
+                for p in inv.get(q, ()):
+                    b = bloc_de[p]
+                    frontiere = debut[b] + marques[b]
+                    if position[p] < frontiere:
+                        continue  # déjà marqué
+                    autre = elements[frontiere]
+                    elements[frontiere], elements[position[p]] = p, autre
+                    position[autre], position[p] = position[p], frontiere
+                    if marques[b] == 0:
+                        touches.append(b)
+                    marques[b] += 1
+
+            # Découper les blocs partiellement marqués
+            for b in touches:
+                nb_marques, marques[b] = marques[b], 0
+                if nb_marques == fin[b] - debut[b]:
                     continue
-
-                groupes = {}
-                for etat in partition:
-                    signature = tuple(
-                        frozenset({t.destination for t in self.transitions
-                                   if t.source == etat and t.symbole == symbole})
-                        for symbole in self.alphabet
-                    )
-                    if signature not in groupes:
-                        groupes[signature] = set()
-                    groupes[signature].add(etat)
-
-                nouvelles_partitions.extend(groupes.values())
-
-            if nouvelles_partitions == partitions:
-                break
-            partitions = nouvelles_partitions
-
-        # Création du nouvel automate minimal
-        automate_min = Automate(self.nom + "_minimal")
-        correspondance = {min(part): part for part in partitions}
-
-        # Ajout des états
-        for representant in correspondance:
-            est_final = any(e in finaux for e in correspondance[representant])
-            est_initial = any(e in [e.nom for e in self.etats.values() if e.est_initial]
-                              for e in correspondance[representant])
-            automate_min.ajouter_etat(representant, est_initial, est_final)
-
-        # Ajout des transitions
-        for part in partitions:
-            representant = f"G{partitions.index(part)}"
-            representant = min(part)
-            transitions_vues = set()
-            for t in self.transitions:
-                if t.source in part and (t.symbole, t.destination) not in transitions_vues:
-                    dest_repr = min([p for p in partitions if t.destination in p][0])
-                    automate_min.ajouter_transition(representant, t.symbole, dest_repr)
-                    transitions_vues.add((t.symbole, dest_repr))
+                nouveau = len(debut)
+                debut.append(debut[b])
+                fin.append(debut[b] + nb_marques)
+                marques.append(0)
+                debut[b] += nb_marques
+                for q in elements[debut[nouveau]:fin[nouveau]]:
+                    bloc_de[q] = nouveau
+                plus_petit = nouveau if nb_marques <= fin[b] - debut[b] else b
+                for d in range(len(symboles)):
+                    if (b, d) in en_attente:
+                        ajout = (nouveau, d)
+                    else:
+                        ajout = (plus_petit, d)
+                    en_attente.add(ajout)
+                    a_traiter.append(ajout)
+
+        partiel = any(len(inv[puits]) > 1 for inv in inverse)
+        bloc_mort = bloc_de[puits] if partiel and n and bloc_de[0] != bloc_de[puits] else None
+
+        # Création du nouvel automate minimal : chaque bloc est nommé par son plus petit état,
+        # dont il reprend les transitions. Si une transition manque, le bloc du puits virtuel
+        # ne contient que des états morts : il n'est pas créé et l'automate reste partiel
+        # (sauf s'il contient l'état initial, pour un langage vide).
+        automate_min = Automate(self.nom + "_minimal", alphabet=self.alphabet.copy())
+        representants = {}
+        for b in range(len(debut)):
+            membres = [noms[q] for q in elements[debut[b]:fin[b]] if q != puits]
+            if membres and b != bloc_mort:
+                representants[b] = min(membres)
+
+        for b, representant in representants.items():
+            membres = [noms[q] for q in elements[debut[b]:fin[b]] if q != puits]
+            automate_min.ajouter_etat(
+                representant,
+                est_initial=any(self.etats[m].est_initial for m in membres),
+                est_final=self.etats[membres[0]].est_final
+            )
+
+        automate_min.ajouter_transitions_lot(
+            (representant, symbole, representants[bloc_de[indice[destination]]])
+            for b, representant in representants.items()
+            for symbole, destinations in self.transitions_sortantes(representant).items()
+            for destination in destinations
+            if bloc_de[indice[destination]] != bloc_mort
+        )
 
         return automate_min
 
+    def _numerotation_canonique(self):
+        """
+        Numérote les états utiles (accessibles et co-accessibles) de l'AFD dans l'ordre d'un
+        parcours en largeur depuis l'état initial, symboles triés. Les transitions vers les
+        autres états vont vers un puits implicite, noté -1 dans la table.
+        Retourne (ordre, alphabet, table, finaux).
+        """
+        if not self.est_deterministe():
+            raise ValueError("L'automate doit être déterministe pour calculer sa forme canonique.")
+        alphabet = sorted(self.alphabet)
+
+        # États co-accessibles : ceux depuis lesquels un état final est atteignable
+        utiles = {nom for nom, etat in self.etats.items() if etat.est_final}
+        a_traiter = list(utiles)
+        pred = self._index_pred()
+        while a_traiter:
+            etat = a_traiter.pop()
+            for sources in pred.get(etat, {}).values():
+                for source in sources:
+                    if source not in utiles:
+                        utiles.add(source)
+                        a_traiter.append(source)
+
+        initial = self.get_etat_initial()
+        ordre = [initial] if initial in utiles else []
+        numeros = {etat: i for i, etat in enumerate(ordre)}
+        table = []
+        for etat in ordre:  # la liste grandit pendant le parcours
+            sortantes = self.transitions_sortantes(etat)
+            ligne = []
+            for symbole in alphabet:
+                destination = next(iter(sortantes.get(symbole, ())), None)
+                if destination not in utiles:
+                    ligne.append(-1)
+                    continue
+                if destination not in numeros:
+                    numeros[destination] = len(ordre)
+                    ordre.append(destination)
+                ligne.append(numeros[destination])
+            table.append(ligne)
+        finaux = [i for i, etat in enumerate(ordre) if self.etats[etat].est_final]
+        return ordre, alphabet, table, finaux
+
+    def forme_canonique(self):
+        """
+        AFD émondé dont les états sont renommés "0", "1", ... dans l'ordre du parcours en largeur :
+        deux AFD minimaux reconnaissant le même langage ont la même forme canonique.
+        Le puits est implicite : une transition absente mène à un état rejetant.
+        """
+        ordre, alphabet, table, finaux = self._numerotation_canonique()
+        if not ordre:
+            # Langage vide : un unique état initial non final
+            return Automate.from_arrays(["0"], [], 0, [], [], [], nom=self.nom + "_canonique", alphabet=alphabet)
+        sources, symboles, destinations = [], [], []
+        for source, ligne in enumerate(table):
+            for c, destination in enumerate(ligne):
+                if destination >= 0:
+                    sources.append(source)
+                    symboles.append(alphabet[c])
+                    destinations.append(destination)
+        return Automate.from_arrays(
+            [str(i) for i in range(len(ordre))], finaux, 0, sources, symboles, destinations,
+            nom=self.nom + "_canonique", alphabet=alphabet
+        )
+
+    def empreinte(self):
+        """Empreinte SHA-256 (hexadécimale) de la forme canonique, indépendante des noms d'états"""
+        _, alphabet, table, finaux = self._numerotation_canonique()
+        contenu = json.dumps({"alphabet": alphabet, "finaux": finaux, "table": table}, ensure_ascii=False)
+        return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
     def __repr__(self):
         res = f"Automate : {self.nom}\n"
         res += f"États initiaux : {[e.nom for e in self.etats.values() if e.est_initial]}\n"
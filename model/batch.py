@@ -0,0 +1,203 @@
+"""
+Traitement en lot, sans interface graphique :
+
+    python -m model.batch DOSSIER --pipeline determiniser,minimiser,completer
+
+Chaque automate du dossier (JSON ou binaire) passe par les étapes du pipeline dans un
+pool de processus ; les résultats sont écrits dans le dossier de sortie avec un résumé
+des durées (resume.json). N'importe ni PyQt5 ni graphviz.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from model.automate import Automate
+from model.cache import CacheAutomates
+from model.format_binaire import EXTENSION_BINAIRE
+
+# Noms d'étapes acceptés -> méthode de Automate
+ETAPES = {
+    "determiniser": "determiniser",
+    "determinize": "determiniser",
+    "minimiser": "minimiser",
+    "minimize": "minimiser",
+    "completer": "completer",
+    "complete": "completer",
+}
+EXTENSIONS = (".json", EXTENSION_BINAIRE)
+NOM_RESUME = "resume.json"
+
+
+def lire_pipeline(texte):
+    """Convertit « determinize,minimize » en liste de méthodes ; ValueError si une étape est inconnue"""
+    etapes = [e.strip().lower() for e in texte.split(",") if e.strip()]
+    inconnues = [e for e in etapes if e not in ETAPES]
+    if inconnues or not etapes:
+        raise ValueError(
+            f"Étape(s) inconnue(s) : {', '.join(inconnues) or '(pipeline vide)'}. "
+            f"Étapes possibles : {', '.join(sorted(set(ETAPES.values())))}"
+        )
+    return [ETAPES[e] for e in etapes]
+
+
+def lister_automates(dossier):
+    return sorted(p for p in Path(dossier).iterdir() if p.is_file() and p.suffix.lower() in EXTENSIONS)
+
+
+def noms_sortie(fichiers, extension):
+    """
+    Nom du résultat de chaque fichier : son nom sans extension, sauf si plusieurs fichiers
+    le partagent (a.json et a.autb) ; ils gardent alors leur extension (a.json.json, a.autb.json).
+    La casse est ignorée : les deux fichiers se confondraient sous Windows ou macOS.
+    """
+    nombre = {}
+    for chemin in fichiers:
+        nombre[chemin.stem.lower()] = nombre.get(chemin.stem.lower(), 0) + 1
+    return [
+        (chemin.stem if nombre[chemin.stem.lower()] == 1 else chemin.name) + extension
+        for chemin in fichiers
+    ]
+
+
+def traiter_fichier(chemin, nom_sortie, etapes, dossier_sortie, dossier_cache=None):
+    """
+    Applique les étapes à un fichier ; exécuté dans un processus du pool.
+    Retourne un dictionnaire sérialisable : statut, erreur éventuelle et durées par étape.
+    """
+    resultat = {"fichier": str(chemin), "statut": "ok", "durees": {}}
+    debut = time.perf_counter()
+    try:
+        automate = Automate.charger(str(chemin))
+        resultat["durees"]["chargement"] = time.perf_counter() - debut
+        resultat["etats_entree"] = len(automate.etats)
+        cache = CacheAutomates(dossier_cache) if dossier_cache else None
+        for etape in etapes:
+            t = time.perf_counter()
+            automate = cache.calculer(automate, etape) if cache else getattr(automate, etape)()
+            resultat["durees"][etape] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        sortie = Path(dossier_sortie) / nom_sortie
+        automate.sauvegarder(str(sortie))
+        resultat["durees"]["ecriture"] = time.perf_counter() - t
+        resultat["etats_sortie"] = len(automate.etats)
+        resultat["sortie"] = str(sortie)
+    except Exception as e:
+        resultat["statut"] = "echec"
+        resultat["erreur"] = f"{type(e).__name__}: {e}"
+    resultat["duree"] = time.perf_counter() - debut
+    return resultat
+
+
+def executer(dossier, etapes, dossier_sortie, processus=None, extension=".json", dossier_cache=None, progression=None):
+    """Traite tout le dossier et retourne le résumé (aussi écrit dans dossier_sortie/resume.json)"""
+    fichiers = lister_automates(dossier)
+    Path(dossier_sortie).mkdir(parents=True, exist_ok=True)
+    processus = processus or os.cpu_count() or 1
+    # Des lots de fichiers par tâche : limite les allers-retours avec les processus
+    taille_lot = max(1, len(fichiers) // (processus * 8))
+
+    debut = time.perf_counter()
+    resultats = []
+    with ProcessPoolExecutor(max_workers=processus) as pool:
+        traiter = partial(traiter_fichier, etapes=etapes, dossier_sortie=dossier_sortie,
+                          dossier_cache=dossier_cache)
+        taches = pool.map(traiter, fichiers, noms_sortie(fichiers, extension), chunksize=taille_lot)
+        for resultat in taches:
+            resultats.append(resultat)
+            if progression is not None:
+                progression(len(resultats), len(fichiers))
+    duree = time.perf_counter() - debut
+
+    resume = {
+        "dossier": str(dossier),
+        "pipeline": etapes,
+        "processus": processus,
+        "fichiers": len(fichiers),
+        "reussis": sum(1 for r in resultats if r["statut"] == "ok"),
+        "echecs": sum(1 for r in resultats if r["statut"] != "ok"),
+        "duree_totale": duree,
+        "durees_par_etape": _durees_par_etape(resultats),
+        "resultats": resultats,
+    }
+    with open(Path(dossier_sortie) / NOM_RESUME, "w", encoding="utf-8") as f:
+        json.dump(resume, f, indent=2, ensure_ascii=False)
+    return resume
+
+
+def _durees_par_etape(resultats):
+    """Cumul, moyenne et maximum de chaque étape sur les fichiers traités avec succès"""
+    par_etape = {}
+    for resultat in resultats:
+        if resultat["statut"] != "ok":
+            continue
+        for etape, duree in resultat["durees"].items():
+            par_etape.setdefault(etape, []).append(duree)
+    return {
+        etape: {"total": sum(d), "moyenne": sum(d) / len(d), "max": max(d)}
+        for etape, d in par_etape.items()
+    }
+
+
+def afficher_resume(resume, nb_lents=5):
+    print(f"{resume['fichiers']} automate(s) traité(s) en {resume['duree_totale']:.2f} s "
+          f"avec {resume['processus']} processus : {resume['reussis']} réussi(s), {resume['echecs']} échec(s)")
+    print(f"{'Étape':<14}{'Total (s)':>12}{'Moyenne (ms)':>15}{'Max (ms)':>12}")
+    for etape, d in resume["durees_par_etape"].items():
+        print(f"{etape:<14}{d['total']:>12.2f}{d['moyenne'] * 1000:>15.1f}{d['max'] * 1000:>12.1f}")
+    lents = sorted((r for r in resume["resultats"] if r["statut"] == "ok"), key=lambda r: r["duree"], reverse=True)
+    if lents:
+        print("Plus lents :")
+        for r in lents[:nb_lents]:
+            print(f"  {r['duree'] * 1000:10.1f} ms  {r['fichier']}")
+    for r in resume["resultats"]:
+        if r["statut"] != "ok":
+            print(f"Échec : {r['fichier']} : {r['erreur']}")
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m model.batch",
+        description="Applique un pipeline d'opérations à tous les automates d'un dossier."
+    )
+    parser.add_argument("dossier", help="dossier contenant les automates (.json ou .autb)")
+    parser.add_argument("--pipeline", required=True,
+                        help="étapes séparées par des virgules, ex. determiniser,minimiser,completer")
+    parser.add_argument("-o", "--sortie", help="dossier des résultats (défaut : DOSSIER/resultats)")
+    parser.add_argument("-j", "--processus", type=int, default=None,
+                        help="nombre de processus (défaut : nombre de processeurs)")
+    parser.add_argument("--format", choices=("json", "autb"), default="json", help="format des résultats")
+    parser.add_argument("--cache", help="dossier d'un cache des automates dérivés, partagé entre exécutions")
+    args = parser.parse_args(arguments)
+
+    try:
+        etapes = lire_pipeline(args.pipeline)
+    except ValueError as e:
+        parser.error(str(e))
+    if not Path(args.dossier).is_dir():
+        parser.error(f"dossier introuvable : {args.dossier}")
+
+    sortie = args.sortie or str(Path(args.dossier) / "resultats")
+    extension = EXTENSION_BINAIRE if args.format == "autb" else ".json"
+
+    def progression(fait, total):
+        print(f"\r{fait}/{total}", end="", file=sys.stderr, flush=True)
+
+    # L'avancement n'est affiché que dans un terminal, pas dans les journaux des tâches planifiées
+    interactif = sys.stderr.isatty()
+    resume = executer(args.dossier, etapes, sortie, args.processus, extension, args.cache,
+                      progression if interactif else None)
+    if interactif:
+        print(file=sys.stderr)
+    afficher_resume(resume)
+    print(f"Résumé détaillé : {Path(sortie) / NOM_RESUME}")
+    return 1 if resume["echecs"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
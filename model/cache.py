@@ -0,0 +1,93 @@
+import hashlib
+import os
+from pathlib import Path
+
+from model.automate import Automate
+from model.fichiers import ecrire_atomique, evincer_lru
+from model.format_binaire import EXTENSION_BINAIRE
+
+# À incrémenter quand le résultat d'une opération change, pour ignorer les anciennes entrées
+VERSION_CACHE = 1
+
+# Opérations mises en cache : nom de la méthode -> suffixe donné au nom du résultat
+OPERATIONS = {
+    "determiniser": "_deterministe",
+    "minimiser": "_minimal",
+    "completer": "_complet",
+}
+
+
+class CacheAutomates:
+    """
+    Cache disque des automates dérivés, adressé par le contenu : la clé combine le hash
+    structurel de l'automate d'entrée et le nom de l'opération. Les résultats sont stockés
+    au format binaire ; les entrées les moins récemment utilisées sont supprimées au-delà
+    de taille_max octets.
+    """
+
+    def __init__(self, dossier="cache", taille_max=256 * 1024 * 1024):
+        self.dossier = Path(dossier)
+        self.taille_max = taille_max
+        self.dossier.mkdir(parents=True, exist_ok=True)
+
+    def cle(self, automate, operation):
+        return hashlib.sha256(
+            f"{VERSION_CACHE}:{operation}:{automate.hash_structurel()}".encode("utf-8")
+        ).hexdigest()
+
+    def _chemin(self, cle):
+        return self.dossier / f"{cle}{EXTENSION_BINAIRE}"
+
+    def calculer(self, automate, operation, progression=None):
+        """
+        Retourne le résultat de automate.<operation>(), depuis le cache si possible.
+        progression est transmis à l'opération quand elle doit être calculée.
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Opération non prise en charge par le cache : {operation}")
+
+        chemin = self._chemin(self.cle(automate, operation))
+        resultat = self._lire(chemin)
+        if resultat is None:
+            resultat = getattr(automate, operation)(progression)
+            self._ecrire(chemin, resultat)
+            self._evincer()
+        # Le contenu ne dépend pas du nom : on renomme d'après l'automate d'entrée
+        resultat.nom = automate.nom + OPERATIONS[operation]
+        return resultat
+
+    def _lire(self, chemin):
+        try:
+            resultat = Automate.load_binary(chemin)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # Entrée corrompue ou d'un autre format : on la recalcule
+            self._supprimer(chemin)
+            return None
+        try:
+            os.utime(chemin)  # la date de modification sert d'horodatage LRU
+        except OSError:
+            pass
+        return resultat
+
+    @staticmethod
+    def _ecrire(chemin, automate):
+        try:
+            ecrire_atomique(chemin, automate.to_bytes())
+        except OSError:
+            pass  # le cache n'est qu'une optimisation
+
+    def _evincer(self):
+        evincer_lru(self.dossier, self.taille_max, f"*{EXTENSION_BINAIRE}")
+
+    def vider(self):
+        for chemin in self.dossier.glob(f"*{EXTENSION_BINAIRE}"):
+            self._supprimer(chemin)
+
+    @staticmethod
+    def _supprimer(chemin):
+        try:
+            os.remove(chemin)
+        except OSError:
+            pass
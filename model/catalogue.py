@@ -0,0 +1,249 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from model.automate import Automate, PAS_PROGRESSION
+from model.format_binaire import EXTENSION_BINAIRE
+
+NOM_CATALOGUE = "catalogue.db"
+# À incrémenter quand les colonnes changent : le catalogue est alors reconstruit
+VERSION_CATALOGUE = 1
+EXTENSIONS = (".json", EXTENSION_BINAIRE)
+# Au-delà de ce nombre de transitions, la minimalité n'est pas calculée pendant la relecture
+# (une minimisation par fichier) : elle reste inconnue jusqu'à calculer_minimalite
+SEUIL_MINIMALITE = 20_000
+
+COLONNES = (
+    "chemin", "nom", "mtime_ns", "taille", "nb_etats", "nb_transitions", "alphabet",
+    "deterministe", "complet", "minimal", "hash", "erreur",
+)
+
+
+class Catalogue:
+    """
+    Index SQLite des automates d'un espace de travail (base_path/<nom>/<nom>.json) :
+    nom, taille, alphabet, propriétés et hash structurel de chaque fichier. Seuls les
+    fichiers dont la date de modification ou la taille a changé sont relus ; la minimalité
+    des grands automates déterministes est calculée à la demande (calculer_minimalite).
+    """
+
+    def __init__(self, dossier):
+        self.dossier = Path(dossier)
+        self.connexion = sqlite3.connect(str(self.dossier / NOM_CATALOGUE), timeout=10, isolation_level=None)
+        self.connexion.row_factory = sqlite3.Row
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self._initialiser()
+
+    def _initialiser(self):
+        if self.connexion.execute("PRAGMA user_version").fetchone()[0] == VERSION_CATALOGUE:
+            return
+        self.connexion.execute("BEGIN IMMEDIATE")
+        try:
+            self.connexion.execute("DROP TABLE IF EXISTS automates")
+            self.connexion.execute(
+                "CREATE TABLE automates ("
+                "chemin TEXT PRIMARY KEY, nom TEXT NOT NULL, mtime_ns INTEGER NOT NULL, taille INTEGER NOT NULL, "
+                "nb_etats INTEGER, nb_transitions INTEGER, alphabet TEXT, "
+                "deterministe INTEGER, complet INTEGER, minimal INTEGER, hash TEXT, erreur TEXT)"
+            )
+            self.connexion.execute("CREATE INDEX automates_nom ON automates (nom COLLATE NOCASE)")
+            self.connexion.execute("CREATE INDEX automates_hash ON automates (hash)")
+            self.connexion.execute(f"PRAGMA user_version = {VERSION_CATALOGUE}")
+            self.connexion.execute("COMMIT")
+        except Exception:
+            self.connexion.execute("ROLLBACK")
+            raise
+
+    def _fichiers(self):
+        """Fichiers d'automates de l'espace de travail, un niveau de sous-dossiers"""
+        return [
+            p for p in self.dossier.glob("*/*")
+            if p.suffix.lower() in EXTENSIONS and p.is_file()
+        ]
+
+    def _relatif(self, chemin):
+        return Path(chemin).resolve().relative_to(self.dossier.resolve()).as_posix()
+
+    def mettre_a_jour(self, progression=None):
+        """
+        Synchronise le catalogue avec le disque : relit les fichiers nouveaux ou modifiés
+        (date, taille) et retire ceux qui ont disparu. Retourne (relus, retires).
+        progression(fichiers_examines, nombre_de_fichiers) est appelé régulièrement.
+        """
+        connus = {
+            ligne["chemin"]: (ligne["mtime_ns"], ligne["taille"])
+            for ligne in self.connexion.execute("SELECT chemin, mtime_ns, taille FROM automates")
+        }
+        fichiers = self._fichiers()
+        presents = set()
+        relus = []
+        for i, chemin in enumerate(fichiers):
+            if progression is not None and i % PAS_PROGRESSION == 0:
+                progression(i, len(fichiers))
+            relatif = self._relatif(chemin)
+            presents.add(relatif)
+            infos = chemin.stat()
+            if connus.get(relatif) != (infos.st_mtime_ns, infos.st_size):
+                relus.append(self._decrire(chemin, relatif, infos))
+        retires = [(chemin,) for chemin in connus if chemin not in presents]
+
+        # Une seule transaction : un lecteur voit l'ancien ou le nouveau catalogue, jamais un mélange
+        self.connexion.execute("BEGIN IMMEDIATE")
+        try:
+            self.connexion.executemany(
+                f"INSERT OR REPLACE INTO automates ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})",
+                relus
+            )
+            self.connexion.executemany("DELETE FROM automates WHERE chemin = ?", retires)
+            self.connexion.execute("COMMIT")
+        except Exception:
+            self.connexion.execute("ROLLBACK")
+            raise
+        return len(relus), len(retires)
+
+    def indexer(self, chemin, automate=None):
+        """Met à jour l'entrée d'un fichier qui vient d'être écrit, sans le relire si l'automate est fourni"""
+        chemin = Path(chemin)
+        ligne = self._decrire(chemin, self._relatif(chemin), chemin.stat(), automate)
+        self.connexion.execute(
+            f"INSERT OR REPLACE INTO automates ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})",
+            ligne
+        )
+
+    def retirer(self, chemin):
+        """Retire un fichier, ou tous les fichiers d'un dossier supprimé"""
+        relatif = self._relatif(chemin)
+        self.connexion.execute(
+            "DELETE FROM automates WHERE chemin = ? OR chemin LIKE ? ESCAPE '\\'",
+            (relatif, _echapper_like(relatif) + "/%")
+        )
+
+    @staticmethod
+    def _decrire(chemin, relatif, infos, automate=None):
+        """Ligne du catalogue pour un fichier ; un fichier illisible est gardé avec son erreur"""
+        try:
+            if automate is None:
+                automate = Automate.charger(str(chemin))
+            deterministe = automate.est_deterministe()
+            return (
+                relatif, automate.nom or chemin.stem, infos.st_mtime_ns, infos.st_size,
+                len(automate.etats), len(automate.transitions), json.dumps(sorted(automate.alphabet), ensure_ascii=False),
+                deterministe, automate.est_complet(), Catalogue._minimalite(automate, deterministe),
+                automate.hash_structurel(), None,
+            )
+        except Exception as e:
+            return (relatif, chemin.stem, infos.st_mtime_ns, infos.st_size,
+                    None, None, None, None, None, None, None, f"{type(e).__name__}: {e}")
+
+    @staticmethod
+    def _minimalite(automate, deterministe):
+        """
+        Minimalité connue sans minimiser un grand automate : None si elle ne s'applique pas
+        (non déterministe) ou reste à calculer (plus de SEUIL_MINIMALITE transitions)
+        """
+        if not deterministe:
+            return None
+        # Un état inaccessible disparaît à la minimisation
+        if len(automate.etats_accessibles()) < len(automate.etats):
+            return False
+        if len(automate.transitions) > SEUIL_MINIMALITE:
+            return None
+        return automate.est_minimal()
+
+    def minimalites_inconnues(self):
+        """Nombre d'automates déterministes dont la minimalité reste à calculer"""
+        return self.connexion.execute(
+            "SELECT COUNT(*) FROM automates WHERE deterministe = 1 AND minimal IS NULL AND erreur IS NULL"
+        ).fetchone()[0]
+
+    def calculer_minimalite(self, progression=None, cache=None):
+        """
+        Calcule la minimalité laissée inconnue par la relecture. Avec un CacheAutomates, les
+        automates minimisés sont partagés avec la fenêtre d'analyse (même hash structurel).
+        Un fichier modifié ou illisible entre-temps est laissé à la prochaine relecture.
+        Retourne le nombre d'entrées mises à jour.
+        """
+        lignes = self.connexion.execute(
+            "SELECT chemin, mtime_ns, taille FROM automates "
+            "WHERE deterministe = 1 AND minimal IS NULL AND erreur IS NULL ORDER BY nb_transitions"
+        ).fetchall()
+        mises_a_jour = 0
+        for i, ligne in enumerate(lignes):
+            # Appelé aussi pendant chaque minimisation, pour qu'une annulation soit prise en compte
+            def avancer(fait=None, total=None, i=i):
+                if progression is not None:
+                    progression(i, len(lignes))
+
+            avancer()
+            try:
+                automate = Automate.charger(str(self.dossier / ligne["chemin"]))
+            except Exception:
+                continue
+            if cache is not None:
+                minimise = cache.calculer(automate, "minimiser", avancer)
+            else:
+                minimise = automate.minimiser(avancer)
+            curseur = self.connexion.execute(
+                "UPDATE automates SET minimal = ? WHERE chemin = ? AND mtime_ns = ? AND taille = ?",
+                (len(minimise.etats) == len(automate.etats), ligne["chemin"], ligne["mtime_ns"], ligne["taille"])
+            )
+            mises_a_jour += curseur.rowcount
+        return mises_a_jour
+
+    def rechercher(self, texte="", deterministe=None, complet=None, minimal=None,
+                   symbole=None, etats_max=None, limite=None):
+        """
+        Automates dont le nom contient texte (sans tenir compte de la casse), filtrés par
+        propriétés (None : indifférent) ; liste de dictionnaires triée par nom.
+        """
+        conditions, parametres = [], []
+        if texte:
+            conditions.append("nom LIKE ? ESCAPE '\\'")
+            parametres.append(f"%{_echapper_like(texte)}%")
+        for colonne, valeur in (("deterministe", deterministe), ("complet", complet), ("minimal", minimal)):
+            if valeur is not None:
+                conditions.append(f"{colonne} = ?")
+                parametres.append(bool(valeur))
+        if symbole:
+            # L'alphabet est une liste JSON : chaque symbole y apparaît entre guillemets
+            conditions.append("alphabet LIKE ? ESCAPE '\\'")
+            parametres.append(f"%{_echapper_like(json.dumps(symbole, ensure_ascii=False))}%")
+        if etats_max is not None:
+            conditions.append("nb_etats <= ?")
+            parametres.append(etats_max)
+        requete = "SELECT * FROM automates"
+        if conditions:
+            requete += " WHERE " + " AND ".join(conditions)
+        requete += " ORDER BY nom COLLATE NOCASE, chemin"
+        if limite is not None:
+            requete += " LIMIT ?"
+            parametres.append(limite)
+        return [self._vers_dict(ligne) for ligne in self.connexion.execute(requete, parametres)]
+
+    def compter(self):
+        return self.connexion.execute("SELECT COUNT(*) FROM automates").fetchone()[0]
+
+    def doublons(self, hash_structurel):
+        """Automates du catalogue ayant exactement la même structure"""
+        return [self._vers_dict(ligne) for ligne in self.connexion.execute(
+            "SELECT * FROM automates WHERE hash = ? ORDER BY chemin", (hash_structurel,)
+        )]
+
+    def chemin_absolu(self, entree):
+        return str(self.dossier / entree["chemin"])
+
+    @staticmethod
+    def _vers_dict(ligne):
+        entree = dict(ligne)
+        entree["alphabet"] = json.loads(entree["alphabet"]) if entree["alphabet"] else []
+        for colonne in ("deterministe", "complet", "minimal"):
+            if entree[colonne] is not None:
+                entree[colonne] = bool(entree[colonne])
+        return entree
+
+    def fermer(self):
+        self.connexion.close()
+
+
+def _echapper_like(texte):
+    return texte.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
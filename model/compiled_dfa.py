@@ -0,0 +1,159 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel : repli sur la boucle Python
+    np = None
+
+
+class CompiledDFA:
+    """Automate déterministe figé : états et symboles codés par des entiers denses"""
+
+    SANS_TRANSITION = -1
+
+    def __init__(self, etats, symboles, table, finaux, initial):
+        self.etats = list(etats)  # indice -> nom d'état
+        self.symboles = list(symboles)  # indice -> symbole
+        self.index_etats = {nom: i for i, nom in enumerate(self.etats)}
+        self.index_symboles = {s: i for i, s in enumerate(self.symboles)}
+        # table[q * nb_symboles + s] = état suivant, ou SANS_TRANSITION
+        self.table = table
+        self.finaux = finaux  # bitmap : finaux[q] vaut 1 si q est final
+        self.initial = initial
+        self._tables_np = None
+
+    @staticmethod
+    def depuis_automate(automate):
+        if not automate.est_deterministe():
+            raise ValueError("L'automate doit être déterministe pour être compilé.")
+        if sum(1 for etat in automate.etats.values() if etat.est_initial) > 1:
+            raise ValueError("L'automate doit avoir un seul état initial pour être compilé.")
+
+        etats = list(automate.etats)
+        symboles = sorted(automate.alphabet)
+        index_etats = {nom: i for i, nom in enumerate(etats)}
+        index_symboles = {s: i for i, s in enumerate(symboles)}
+        nb_symboles = len(symboles)
+
+        table = array('i', [CompiledDFA.SANS_TRANSITION]) * (len(etats) * nb_symboles)
+        for t in automate.transitions:
+            table[index_etats[t.source] * nb_symboles + index_symboles[t.symbole]] = index_etats[t.destination]
+
+        finaux = bytearray(len(etats))
+        for nom, etat in automate.etats.items():
+            if etat.est_final:
+                finaux[index_etats[nom]] = 1
+
+        initial = automate.get_etat_initial()
+        initial = index_etats[initial] if initial is not None else CompiledDFA.SANS_TRANSITION
+        return CompiledDFA(etats, symboles, table, finaux, initial)
+
+    @property
+    def nb_etats(self):
+        return len(self.etats)
+
+    @property
+    def nb_symboles(self):
+        return len(self.symboles)
+
+    def run(self, mot):
+        """Retourne l'indice de l'état atteint après lecture du mot, ou SANS_TRANSITION"""
+        etat = self.initial
+        if etat < 0:
+            return self.SANS_TRANSITION
+        table = self.table
+        index_symboles = self.index_symboles
+        nb_symboles = len(self.symboles)
+        for symbole in mot:
+            colonne = index_symboles.get(symbole)
+            if colonne is None:
+                return self.SANS_TRANSITION  # symbole inconnu
+            etat = table[etat * nb_symboles + colonne]
+            if etat < 0:
+                return self.SANS_TRANSITION
+        return etat
+
+    def accepts(self, mot):
+        etat = self.run(mot)
+        return etat >= 0 and self.finaux[etat] == 1
+
+    def accepts_many(self, mots):
+        """Teste un lot de mots ; retourne un tableau NumPy de booléens si NumPy est disponible"""
+        if np is None:
+            accepts = self.accepts
+            return [accepts(mot) for mot in mots]
+        mots = list(mots)
+        if not all(isinstance(mot, str) for mot in mots):
+            # Mots donnés comme séquences de symboles : le codage vectorisé ne lit que des chaînes
+            return np.fromiter(map(self.accepts, mots), dtype=bool, count=len(mots))
+        return self._accepts_many_np(mots)
+
+    def _preparer_tables_np(self):
+        """Construit la table étendue (état mort, colonnes de bourrage et de symbole inconnu)"""
+        nb_etats, nb_symboles = len(self.etats), len(self.symboles)
+        mort = nb_etats
+        bourrage, inconnu = nb_symboles, nb_symboles + 1
+
+        table = np.full((nb_etats + 1, nb_symboles + 2), mort, dtype=np.intp)
+        if nb_etats and nb_symboles:
+            base = np.asarray(self.table, dtype=np.intp).reshape(nb_etats, nb_symboles)
+            table[:nb_etats, :nb_symboles] = np.where(base < 0, mort, base)
+        table[:, bourrage] = np.arange(nb_etats + 1)  # le bourrage laisse l'état inchangé
+        table[:, inconnu] = mort
+
+        finaux = np.zeros(nb_etats + 1, dtype=bool)
+        finaux[:nb_etats] = np.frombuffer(bytes(self.finaux), dtype=np.uint8) == 1
+
+        # Table de correspondance point de code -> colonne ; la dernière case sert aux
+        # caractères inconnus. Seuls les symboles d'un caractère peuvent apparaître dans un mot.
+        simples = {ord(s): i for i, s in enumerate(self.symboles) if len(s) == 1}
+        colonnes = np.full(max(simples, default=0) + 2, inconnu, dtype=np.intp)
+        for point_code, colonne in simples.items():
+            colonnes[point_code] = colonne
+        self._tables_np = (table, finaux, colonnes)
+        return self._tables_np
+
+    def _encoder_mots_np(self, mots, colonnes):
+        """Encode les mots dans une matrice (longueur_max, nb_mots) d'indices de colonnes"""
+        bourrage = len(self.symboles)
+        longueurs = np.fromiter(map(len, mots), dtype=np.intp, count=len(mots))
+        longueur_max = int(longueurs.max()) if len(mots) else 0
+        # Une ligne par position : la lecture d'une position est un accès contigu
+        matrice = np.full((longueur_max, len(mots)), bourrage, dtype=np.intp)
+        if longueur_max == 0:
+            return matrice
+
+        caracteres = np.frombuffer("".join(mots).encode("utf-32-le"), dtype=np.uint32)
+        codes = colonnes[np.minimum(caracteres, len(colonnes) - 1)]
+        presents = np.arange(longueur_max) < longueurs[:, None]
+        matrice.T[presents] = codes
+        return matrice
+
+    def _accepts_many_np(self, mots):
+        table, finaux, colonnes = self._tables_np or self._preparer_tables_np()
+        matrice = self._encoder_mots_np(mots, colonnes)
+
+        mort = len(self.etats)
+        resultat = np.zeros(len(mots), dtype=bool)
+        if self.initial < 0:
+            return resultat
+
+        # Tous les mots encore vivants avancent d'un symbole à chaque pas ;
+        # ceux qui tombent dans l'état mort sont retirés du lot.
+        indices = np.arange(len(mots))
+        etats = np.full(len(mots), self.initial, dtype=np.intp)
+        for ligne in matrice:
+            etats = table[etats, ligne[indices]]
+            vivants = etats != mort
+            if not vivants.all():
+                indices, etats = indices[vivants], etats[vivants]
+                if not len(indices):
+                    break
+        resultat[indices] = finaux[etats]
+        return resultat
+
+    def nom_etat(self, indice):
+        return self.etats[indice] if indice >= 0 else None
+
+    def __repr__(self):
+        return f"CompiledDFA({self.nb_etats} états, {self.nb_symboles} symboles)"
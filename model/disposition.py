@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+
+from model.fichiers import ecrire_atomique, evincer_lru
+
+# À incrémenter quand le calcul d'une disposition change, pour ignorer les anciennes entrées
+VERSION_DISPOSITION = 1
+# Au-delà de ce nombre d'états, dot devient trop lent : on garde la disposition en couches
+SEUIL_GRAPHVIZ = 300
+
+ESPACEMENT_COUCHES = 140.0
+ESPACEMENT_ETATS = 80.0
+MARGE = 40.0
+POINTS_PAR_POUCE = 72.0
+
+
+class Disposition:
+    """
+    Placement d'un automate, en points, axe y vers le bas :
+    etats : liste de (nom, x, y, est_initial, est_final) ; x, y désignent le centre.
+    aretes : liste de (source, destination, étiquette, points) ; points est la liste des
+    points de contrôle d'une B-spline (Graphviz) ou vide pour un tracé direct.
+    """
+
+    def __init__(self, largeur, hauteur, etats, aretes, moteur):
+        self.largeur = largeur
+        self.hauteur = hauteur
+        self.etats = etats
+        self.aretes = aretes
+        self.moteur = moteur
+
+    def to_dict(self):
+        return {
+            "largeur": self.largeur,
+            "hauteur": self.hauteur,
+            "etats": self.etats,
+            "aretes": self.aretes,
+            "moteur": self.moteur,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        return Disposition(
+            data["largeur"],
+            data["hauteur"],
+            [tuple(e) for e in data["etats"]],
+            [(s, d, e, [tuple(p) for p in points]) for s, d, e, points in data["aretes"]],
+            data["moteur"],
+        )
+
+
+def _aretes_regroupees(automate):
+    """Une arête par couple (source, destination), étiquetée par ses symboles triés"""
+    symboles = {}
+    for source in automate.etats:
+        for symbole, destinations in automate.transitions_sortantes(source).items():
+            for destination in destinations:
+                symboles.setdefault((str(source), str(destination)), []).append(str(symbole))
+    return [(s, d, ", ".join(sorted(noms)), []) for (s, d), noms in sorted(symboles.items())]
+
+
+def disposer_en_couches(automate):
+    """
+    Disposition intégrée, en O(états + transitions) : une colonne par distance depuis
+    les états initiaux (parcours en largeur), états d'une colonne ordonnés par le
+    barycentre de leurs prédécesseurs déjà placés.
+    """
+    noms = sorted(automate.etats, key=str)
+    rang = {}
+    racines = [n for n in noms if automate.etats[n].est_initial] + noms
+    for racine in racines:
+        if racine in rang:
+            continue
+        rang[racine] = 0
+        file = deque([racine])
+        while file:
+            etat = file.popleft()
+            for destinations in automate.transitions_sortantes(etat).values():
+                for destination in destinations:
+                    if destination not in rang:
+                        rang[destination] = rang[etat] + 1
+                        file.append(destination)
+
+    colonnes = {}
+    for nom in noms:
+        colonnes.setdefault(rang[nom], []).append(nom)
+    hauteur_max = max((len(c) for c in colonnes.values()), default=0)
+
+    pred = {}
+    for source in noms:
+        for destinations in automate.transitions_sortantes(source).values():
+            for destination in destinations:
+                pred.setdefault(destination, set()).add(source)
+    ordonnee = {}
+    for r in sorted(colonnes):
+        colonne = colonnes[r]
+
+        def barycentre(nom):
+            places = [ordonnee[p] for p in pred.get(nom, ()) if p in ordonnee]
+            return sum(places) / len(places) if places else float("inf")
+
+        colonne.sort(key=lambda nom: (barycentre(nom), str(nom)))
+        decalage = (hauteur_max - len(colonne)) * ESPACEMENT_ETATS / 2
+        for i, nom in enumerate(colonne):
+            ordonnee[nom] = MARGE + decalage + i * ESPACEMENT_ETATS
+
+    etats = [
+        (str(nom), MARGE + rang[nom] * ESPACEMENT_COUCHES, ordonnee[nom],
+         automate.etats[nom].est_initial, automate.etats[nom].est_final)
+        for nom in noms
+    ]
+    largeur = 2 * MARGE + max(len(colonnes) - 1, 0) * ESPACEMENT_COUCHES
+    hauteur = 2 * MARGE + max(hauteur_max - 1, 0) * ESPACEMENT_ETATS
+    return Disposition(largeur, hauteur, etats, _aretes_regroupees(automate), "couches")
+
+
+def graphviz_disponible():
+    return shutil.which("dot") is not None
+
+
+def disposer_avec_graphviz(source):
+    """
+    Disposition calculée par dot à partir d'une source DOT (sortie « plain »).
+    Ne touche pas à l'automate : peut tourner dans un thread de travail.
+    """
+    import graphviz
+    texte = graphviz.Source(source).pipe(format="plain").decode("utf-8")
+    return lire_plain(texte)
+
+
+def lire_plain(texte):
+    """Convertit la sortie « plain » de dot (pouces, axe y vers le haut) en Disposition"""
+    hauteur_pouces = 0.0
+    largeur = hauteur = 0.0
+    etats, aretes = [], []
+    for ligne in texte.splitlines():
+        champs = shlex.split(ligne)
+        if not champs:
+            continue
+        if champs[0] == "graph":
+            largeur = float(champs[2]) * POINTS_PAR_POUCE
+            hauteur_pouces = float(champs[3])
+            hauteur = hauteur_pouces * POINTS_PAR_POUCE
+        elif champs[0] == "node" and champs[1] != "init":
+            x, y = float(champs[2]), float(champs[3])
+            forme = champs[8]
+            etats.append([champs[1], x * POINTS_PAR_POUCE, (hauteur_pouces - y) * POINTS_PAR_POUCE,
+                          False, forme == "doublecircle"])
+        elif champs[0] == "edge":
+            source, destination, nb_points = champs[1], champs[2], int(champs[3])
+            if source == "init":
+                for etat in etats:
+                    if etat[0] == destination:
+                        etat[3] = True
+                continue
+            valeurs = champs[4:4 + 2 * nb_points]
+            points = [
+                (float(valeurs[i]) * POINTS_PAR_POUCE, (hauteur_pouces - float(valeurs[i + 1])) * POINTS_PAR_POUCE)
+                for i in range(0, len(valeurs), 2)
+            ]
+            reste = champs[4 + 2 * nb_points:]
+            etiquette = reste[0] if len(reste) > 4 else ""
+            aretes.append((source, destination, etiquette, points))
+    return Disposition(largeur, hauteur, [tuple(e) for e in etats], aretes, "graphviz")
+
+
+class CacheDispositions:
+    """
+    Dispositions déjà calculées, par hash structurel et moteur : en mémoire puis sur disque.
+    Utilisé à la fois par l'interface et par les threads de calcul : la mémoire est protégée par un verrou.
+    """
+
+    def __init__(self, dossier=None, taille_max=32 * 1024 * 1024, nb_en_memoire=16):
+        self.dossier = Path(dossier) if dossier else Path(tempfile.gettempdir()) / "automates_dispositions"
+        self.taille_max = taille_max
+        self.nb_en_memoire = nb_en_memoire
+        self.memoire = OrderedDict()
+        self.verrou = threading.Lock()
+        self.dossier.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def cle(hash_structurel, moteur):
+        return hashlib.sha256(f"{VERSION_DISPOSITION}:{moteur}:{hash_structurel}".encode("utf-8")).hexdigest()
+
+    def lire(self, cle):
+        with self.verrou:
+            disposition = self.memoire.get(cle)
+            if disposition is not None:
+                self.memoire.move_to_end(cle)
+                return disposition
+        chemin = self.dossier / f"{cle}.json"
+        try:
+            with open(chemin, "r", encoding="utf-8") as f:
+                disposition = Disposition.from_dict(json.load(f))
+            os.utime(chemin)
+        except (OSError, ValueError, KeyError):
+            return None
+        self._memoriser(cle, disposition)
+        return disposition
+
+    def ecrire(self, cle, disposition):
+        self._memoriser(cle, disposition)
+        try:
+            ecrire_atomique(self.dossier / f"{cle}.json",
+                            json.dumps(disposition.to_dict(), ensure_ascii=False).encode("utf-8"))
+            evincer_lru(self.dossier, self.taille_max, "*.json")
+        except OSError:
+            pass  # le cache n'est qu'une optimisation
+
+    def _memoriser(self, cle, disposition):
+        with self.verrou:
+            self.memoire[cle] = disposition
+            self.memoire.move_to_end(cle)
+            while len(self.memoire) > self.nb_en_memoire:
+                self.memoire.popitem(last=False)
+
+    def disposition(self, automate, hash_structurel=None):
+        """
+        Meilleure disposition immédiatement disponible : celle de Graphviz si elle a déjà été
+        calculée, sinon la disposition en couches (calculée et mise en cache au besoin).
+        hash_structurel évite de recalculer automate.hash_structurel() quand l'appelant l'a déjà.
+        """
+        if hash_structurel is None:
+            hash_structurel = automate.hash_structurel()
+        disposition = self.lire(self.cle(hash_structurel, "graphviz"))
+        if disposition is not None:
+            return disposition
+        cle = self.cle(hash_structurel, "couches")
+        disposition = self.lire(cle)
+        if disposition is None:
+            disposition = disposer_en_couches(automate)
+            self.ecrire(cle, disposition)
+        return disposition
+
+
+_cache_par_defaut = None
+
+
+def cache_par_defaut():
+    global _cache_par_defaut
+    if _cache_par_defaut is None:
+        _cache_par_defaut = CacheDispositions()
+    return _cache_par_defaut
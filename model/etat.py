@@ -1,5 +1,7 @@
 #%%
 class Etat:
+    __slots__ = ("nom", "est_initial", "est_final")
+
     def __init__(self, nom, est_initial=False, est_final=False):
         self.nom = nom
         self.est_initial = est_initial
@@ -0,0 +1,43 @@
+import os
+import tempfile
+from pathlib import Path
+
+
+def ecrire_atomique(chemin, octets, mode=None):
+    """
+    Écrit via un fichier temporaire du même dossier : un lecteur ne voit jamais de fichier partiel.
+    mode fixe les permissions du fichier final (sinon celles de mkstemp, lecture/écriture pour le seul propriétaire).
+    """
+    descripteur, temporaire = tempfile.mkstemp(dir=os.path.dirname(chemin) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(descripteur, "wb") as f:
+            f.write(octets)
+        if mode is not None:
+            os.chmod(temporaire, mode)
+        os.replace(temporaire, chemin)
+    except OSError:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+
+def evincer_lru(dossier, taille_max, motif="*"):
+    """Supprime les fichiers les moins récemment utilisés (mtime) tant que le total dépasse taille_max"""
+    entrees = []
+    for chemin in Path(dossier).glob(motif):
+        if chemin.suffix == ".tmp":
+            continue
+        try:
+            infos = chemin.stat()
+        except OSError:
+            continue
+        entrees.append((infos.st_mtime, infos.st_size, chemin))
+    taille = sum(t for _, t, _ in entrees)
+    for _, taille_entree, chemin in sorted(entrees, key=lambda e: e[0]):
+        if taille <= taille_max:
+            break
+        try:
+            os.remove(chemin)
+        except OSError:
+            continue
+        taille -= taille_entree
@@ -0,0 +1,177 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from model.compiled_dfa import CompiledDFA
+
+# Format binaire versionné des automates (petit-boutiste, sections alignées sur 4 octets) :
+#   en-tête      : MAGIQUE, version, drapeaux, nb_etats, nb_symboles, nb_transitions, taille des chaînes
+#   chaînes      : décalages u32[nb_chaines + 1] puis octets UTF-8 (nom, états, symboles)
+#   états        : initiaux u8[nb_etats], finaux u8[nb_etats]
+#   transitions  : sources i32[T], symboles i32[T], destinations i32[T]
+#   table AFD    : i32[nb_etats * nb_symboles], -1 si pas de transition (si DRAPEAU_TABLE_AFD)
+MAGIQUE = b"AUTB"
+VERSION = 1
+EXTENSION_BINAIRE = ".autb"
+DRAPEAU_TABLE_AFD = 1
+
+_EN_TETE = struct.Struct("<4sHHIIII")
+
+
+def _aligner(taille):
+    return (taille + 3) & ~3
+
+
+def _entiers(valeurs=()):
+    entiers = array('i', valeurs)
+    if entiers.itemsize != 4:
+        raise ValueError("Le format binaire suppose des entiers de 4 octets.")
+    return entiers
+
+
+def _petit_boutiste(entiers):
+    """Le format est petit-boutiste : sur une machine gros-boutiste, on permute les octets"""
+    if sys.byteorder != "little":
+        entiers = _entiers(entiers)
+        entiers.byteswap()
+    return entiers
+
+
+def ecrire(automate):
+    """Sérialise l'automate dans le format binaire"""
+    noms = list(automate.etats)
+    symboles = sorted(automate.alphabet | {t.symbole for t in automate.transitions})
+    index_etats = {nom: i for i, nom in enumerate(noms)}
+    index_symboles = {s: i for i, s in enumerate(symboles)}
+
+    # Table des chaînes : nom de l'automate, puis états, puis symboles
+    chaines = [s.encode("utf-8") for s in [str(automate.nom)] + [str(n) for n in noms] + symboles]
+    decalages = _entiers([0])
+    for chaine in chaines:
+        decalages.append(decalages[-1] + len(chaine))
+    octets_chaines = b"".join(chaines)
+
+    sources, lettres, destinations = _entiers(), _entiers(), _entiers()
+    for t in automate.transitions:
+        sources.append(index_etats[t.source])
+        lettres.append(index_symboles[t.symbole])
+        destinations.append(index_etats[t.destination])
+
+    drapeaux = 0
+    table = None
+    if automate.est_deterministe() and sum(1 for e in automate.etats.values() if e.est_initial) <= 1:
+        # Table dense de l'AFD, directement exploitable après un mmap
+        drapeaux |= DRAPEAU_TABLE_AFD
+        table = _entiers([CompiledDFA.SANS_TRANSITION]) * (len(noms) * len(symboles))
+        for s, c, d in zip(sources, lettres, destinations):
+            table[s * len(symboles) + c] = d
+
+    parties = [
+        _EN_TETE.pack(MAGIQUE, VERSION, drapeaux, len(noms), len(symboles),
+                      len(sources), len(octets_chaines)),
+        _petit_boutiste(decalages).tobytes(),
+        octets_chaines.ljust(_aligner(len(octets_chaines)), b"\0"),
+        bytes(1 if automate.etats[n].est_initial else 0 for n in noms).ljust(_aligner(len(noms)), b"\0"),
+        bytes(1 if automate.etats[n].est_final else 0 for n in noms).ljust(_aligner(len(noms)), b"\0"),
+        _petit_boutiste(sources).tobytes(),
+        _petit_boutiste(lettres).tobytes(),
+        _petit_boutiste(destinations).tobytes(),
+    ]
+    if table is not None:
+        parties.append(_petit_boutiste(table).tobytes())
+    return b"".join(parties)
+
+
+def _sections(tampon):
+    """Découpe un tampon (bytes ou mmap) en sections, sans copier les tableaux"""
+    vue = memoryview(tampon)
+    if len(vue) < _EN_TETE.size:
+        raise ValueError("Fichier d'automate binaire tronqué.")
+    magique, version, drapeaux, nb_etats, nb_symboles, nb_transitions, taille_chaines = \
+        _EN_TETE.unpack_from(vue, 0)
+    if magique != MAGIQUE:
+        raise ValueError("Ce fichier n'est pas un automate au format binaire.")
+    if version != VERSION:
+        raise ValueError(f"Version de format binaire non prise en charge : {version}")
+
+    position = _EN_TETE.size
+    sections = {"drapeaux": drapeaux, "nb_etats": nb_etats, "nb_symboles": nb_symboles}
+
+    def prendre(taille):
+        nonlocal position
+        section = vue[position:position + taille]
+        if len(section) != taille:
+            raise ValueError("Fichier d'automate binaire tronqué.")
+        position += _aligner(taille)
+        return section
+
+    nb_chaines = 1 + nb_etats + nb_symboles
+    sections["decalages"] = prendre(4 * (nb_chaines + 1)).cast('i')
+    sections["chaines"] = prendre(taille_chaines)
+    sections["initiaux"] = prendre(nb_etats)
+    sections["finaux"] = prendre(nb_etats)
+    sections["sources"] = prendre(4 * nb_transitions).cast('i')
+    sections["symboles"] = prendre(4 * nb_transitions).cast('i')
+    sections["destinations"] = prendre(4 * nb_transitions).cast('i')
+    if drapeaux & DRAPEAU_TABLE_AFD:
+        sections["table"] = prendre(4 * nb_etats * nb_symboles).cast('i')
+    return sections
+
+
+def _chaines(sections):
+    decalages = _petit_boutiste(sections["decalages"])
+    octets = bytes(sections["chaines"])
+    return [octets[decalages[i]:decalages[i + 1]].decode("utf-8") for i in range(len(decalages) - 1)]
+
+
+def lire(tampon):
+    """Reconstruit un Automate à partir du format binaire"""
+    from model.automate import Automate
+
+    sections = _sections(tampon)
+    nb_etats = sections["nb_etats"]
+    chaines = _chaines(sections)
+    nom, noms, symboles = chaines[0], chaines[1:1 + nb_etats], chaines[1 + nb_etats:]
+
+    initiaux, finaux = sections["initiaux"], sections["finaux"]
+    lettres = _petit_boutiste(sections["symboles"])
+    return Automate.from_arrays(
+        noms,
+        [i for i in range(nb_etats) if finaux[i] == 1],
+        [i for i in range(nb_etats) if initiaux[i] == 1],
+        _petit_boutiste(sections["sources"]).tolist(),
+        [symboles[c] for c in lettres],
+        _petit_boutiste(sections["destinations"]).tolist(),
+        nom=nom,
+        alphabet=set(symboles) - {'ε', ''},
+    )
+
+
+def sauvegarder(automate, chemin):
+    with open(chemin, "wb") as f:
+        f.write(ecrire(automate))
+
+
+def charger(chemin):
+    with open(chemin, "rb") as f:
+        return lire(f.read())
+
+
+def charger_dfa_compile(chemin):
+    """
+    Projette le fichier en mémoire (mmap) et retourne un CompiledDFA qui lit directement
+    la table de transitions du fichier, sans décoder les transitions une à une.
+    """
+    with open(chemin, "rb") as f:
+        projection = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    sections = _sections(projection)
+    if not sections["drapeaux"] & DRAPEAU_TABLE_AFD:
+        raise ValueError("L'automate enregistré n'est pas déterministe.")
+
+    nb_etats = sections["nb_etats"]
+    chaines = _chaines(sections)
+    initiaux = sections["initiaux"]
+    initial = next((i for i in range(nb_etats) if initiaux[i] == 1), CompiledDFA.SANS_TRANSITION)
+    table = sections["table"] if sys.byteorder == "little" else _petit_boutiste(sections["table"])
+    return CompiledDFA(chaines[1:1 + nb_etats], chaines[1 + nb_etats:], table, sections["finaux"], initial)
@@ -0,0 +1,53 @@
+"""
+Inscription d'une promotion d'utilisateurs depuis un fichier CSV, sans interface graphique :
+
+    python -m model.import_utilisateurs nouveaux.csv
+
+Le fichier a une ligne d'en-tête avec les colonnes username et password. Toutes les lignes
+sont validées avant l'écriture ; les lignes valides sont enregistrées en une seule fois et
+chaque ligne refusée est signalée avec son numéro.
+"""
+import argparse
+import csv
+import sys
+
+from model.stockage_utilisateurs import stockage_par_defaut
+from model.user_manager import UserManager
+
+COLONNES = ("username", "password")
+
+
+def lire_csv(chemin):
+    """Retourne la liste des paires (username, password) ; ValueError si une colonne manque"""
+    with open(chemin, newline="", encoding="utf-8-sig") as f:
+        lecteur = csv.DictReader(f)
+        manquantes = [c for c in COLONNES if c not in (lecteur.fieldnames or [])]
+        if manquantes:
+            raise ValueError(f"Colonne(s) manquante(s) dans l'en-tête : {', '.join(manquantes)}")
+        return [((ligne["username"] or "").strip(), ligne["password"] or "") for ligne in lecteur]
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m model.import_utilisateurs",
+        description="Inscrit en une seule transaction les utilisateurs d'un fichier CSV (username,password)."
+    )
+    parser.add_argument("fichier", help="fichier CSV avec une ligne d'en-tête username,password")
+    parser.add_argument("--dossier", default="data", help="dossier des données de l'application (défaut : data)")
+    args = parser.parse_args(arguments)
+
+    try:
+        lignes = lire_csv(args.fichier)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    inscrits, erreurs = UserManager(stockage_par_defaut(args.dossier)).register_users_bulk(lignes)
+    for numero, username, message in erreurs:
+        # +1 : la ligne d'en-tête occupe la première ligne du fichier
+        print(f"Ligne {numero + 1} ({username or 'vide'}) : {message}")
+    print(f"{inscrits} utilisateur(s) inscrit(s), {len(erreurs)} ligne(s) refusée(s) sur {len(lignes)}.")
+    return 1 if erreurs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import json
+import os
+
+TAILLE_BLOC = 1 << 16
+TAILLE_LOT = 10000  # transitions ajoutées d'un coup par Automate.load_json_stream
+# Taille de fichier à partir de laquelle Automate.charger lit en flux plutôt qu'avec json.load :
+# plus lent, mais sans garder le document décodé entier en mémoire
+SEUIL_FLUX = 256 << 20
+# Clés dont les tableaux sont lus élément par élément
+CLES_EN_FLUX = ("etats", "transitions")
+
+_BLANCS = " \t\n\r"
+
+
+class _Lecteur:
+    """Tampon glissant sur un fichier texte, lu par blocs"""
+
+    def __init__(self, fichier, progression=None):
+        self.fichier = fichier
+        self.tampon = ""
+        self.position = 0
+        self.fin = False
+        self.progression = progression
+        self.octets_lus = 0
+        try:
+            self.taille = os.fstat(fichier.fileno()).st_size
+        except (AttributeError, OSError):
+            self.taille = None
+        self.decodeur = json.JSONDecoder()
+
+    def _lire_bloc(self):
+        bloc = self.fichier.read(TAILLE_BLOC)
+        if not bloc:
+            self.fin = True
+            return False
+        # On oublie la partie déjà consommée pour garder une mémoire bornée
+        self.tampon = self.tampon[self.position:] + bloc
+        self.position = 0
+        self.octets_lus += len(bloc.encode("utf-8"))
+        if self.progression:
+            self.progression(self.octets_lus, self.taille)
+        return True
+
+    def caractere(self):
+        """Retourne le prochain caractère significatif sans le consommer ('' en fin de fichier)"""
+        while True:
+            while self.position < len(self.tampon) and self.tampon[self.position] in _BLANCS:
+                self.position += 1
+            if self.position < len(self.tampon):
+                return self.tampon[self.position]
+            if not self._lire_bloc():
+                return ""
+
+    def attendre(self, attendus):
+        c = self.caractere()
+        if c not in attendus:
+            raise ValueError(f"JSON invalide : '{c or 'fin de fichier'}' trouvé au lieu de {' ou '.join(attendus)}")
+        self.position += 1
+        return c
+
+    def valeur(self):
+        """Décode une valeur JSON complète, en lisant d'autres blocs si elle est coupée"""
+        self.caractere()
+        while True:
+            try:
+                valeur, fin = self.decodeur.raw_decode(self.tampon, self.position)
+                # Un nombre en bout de tampon peut se poursuivre dans le bloc suivant
+                if fin < len(self.tampon) or self.fin:
+                    self.position = fin
+                    return valeur
+            except json.JSONDecodeError:
+                if self.fin:
+                    raise
+            self._lire_bloc()
+
+
+def _elements(lecteur):
+    lecteur.attendre("[")
+    if lecteur.caractere() == "]":
+        lecteur.position += 1
+        return
+    while True:
+        yield lecteur.valeur()
+        if lecteur.attendre(",]") == "]":
+            return
+
+
+def iterer_document(fichier, progression=None):
+    """
+    Parcourt un automate au format de Automate.to_dict sans charger tout le fichier.
+    Produit des couples (clé, valeur) : ("etat", {...}) et ("transition", {...}) pour chaque
+    élément des tableaux, (clé, valeur) pour les autres clés. L'ordre des clés est libre.
+    """
+    lecteur = _Lecteur(fichier, progression)
+    lecteur.attendre("{")
+    if lecteur.caractere() == "}":
+        return
+    while True:
+        cle = lecteur.valeur()
+        lecteur.attendre(":")
+        if cle in CLES_EN_FLUX and lecteur.caractere() == "[":
+            for element in _elements(lecteur):
+                yield cle[:-1], element
+        else:
+            yield cle, lecteur.valeur()
+        if lecteur.attendre(",}") == "}":
+            return
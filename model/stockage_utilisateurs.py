@@ -0,0 +1,197 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from model.fichiers import ecrire_atomique
+
+# Version du schéma SQLite, conservée dans PRAGMA user_version (0 : base neuve)
+VERSION_SCHEMA = 1
+# Nombre de paramètres par requête « IN (...) », sous la limite de SQLite
+TAILLE_LOT_SQL = 500
+
+
+class StockageJSON:
+    """
+    Utilisateurs dans un fichier JSON unique {nom: {"password", "created_at"}}.
+    Le contenu est gardé en mémoire et relu seulement si le fichier change (date, taille).
+    """
+
+    def __init__(self, chemin):
+        self.chemin = Path(chemin)
+        self.users = {}
+        self._signature = None  # (date de modification, taille) de la version chargée
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        if not self.chemin.exists():
+            self.chemin.write_text('{}')
+        self._charger()
+
+    def _charger(self):
+        try:
+            signature = self._signature_fichier()
+            if signature == self._signature:
+                return
+            with open(self.chemin, 'r', encoding='utf-8') as f:
+                self.users = json.load(f)
+            # Si le fichier a changé entre stat et la lecture, la signature diffère au prochain appel
+            self._signature = signature
+        except (json.JSONDecodeError, FileNotFoundError):
+            self.users = {}
+            self._sauvegarder()
+
+    def _signature_fichier(self):
+        infos = self.chemin.stat()
+        return infos.st_mtime_ns, infos.st_size
+
+    def _sauvegarder(self):
+        # Le fichier remplacé garde ses permissions (installation partagée entre comptes)
+        try:
+            mode = self.chemin.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        ecrire_atomique(self.chemin, json.dumps(self.users, ensure_ascii=False).encode('utf-8'), mode)
+        self._signature = self._signature_fichier()
+
+    def lire(self, username):
+        self._charger()
+        return self.users.get(username)
+
+    def existe(self, username):
+        return self.lire(username) is not None
+
+    def ajouter(self, username, donnees):
+        """Ajoute un utilisateur ; retourne False s'il existe déjà"""
+        self._charger()
+        if username in self.users:
+            return False
+        self.users[username] = donnees
+        self._sauvegarder()
+        return True
+
+    def ajouter_lot(self, utilisateurs):
+        """
+        Ajoute {nom: donnees} en une seule écriture du fichier.
+        Retourne les noms déjà présents, qui ne sont pas ajoutés.
+        """
+        self._charger()
+        existants = [nom for nom in utilisateurs if nom in self.users]
+        nouveaux = {nom: d for nom, d in utilisateurs.items() if nom not in self.users}
+        if nouveaux:
+            self.users.update(nouveaux)
+            self._sauvegarder()
+        return existants
+
+    def tous(self):
+        self._charger()
+        return dict(self.users)
+
+
+class StockageSQLite:
+    """
+    Utilisateurs dans une base SQLite (une ligne par utilisateur, clé primaire username).
+    Le mode WAL laisse plusieurs instances de l'application lire pendant qu'une autre
+    écrit ; une inscription n'écrit que sa propre ligne.
+    """
+
+    def __init__(self, chemin, migrer_depuis=None):
+        self.chemin = Path(chemin)
+        self.chemin.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None : les transactions sont ouvertes explicitement
+        self.connexion = sqlite3.connect(str(self.chemin), timeout=10, isolation_level=None)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self._initialiser(Path(migrer_depuis) if migrer_depuis else None)
+
+    def _initialiser(self, ancien_fichier):
+        """Crée le schéma et, au premier démarrage, reprend les utilisateurs de l'ancien fichier JSON"""
+        if self.connexion.execute("PRAGMA user_version").fetchone()[0] >= VERSION_SCHEMA:
+            return
+        # BEGIN IMMEDIATE : si deux instances démarrent ensemble, une seule fait la migration
+        self.connexion.execute("BEGIN IMMEDIATE")
+        try:
+            if self.connexion.execute("PRAGMA user_version").fetchone()[0] < VERSION_SCHEMA:
+                self.connexion.execute(
+                    "CREATE TABLE IF NOT EXISTS utilisateurs ("
+                    "username TEXT PRIMARY KEY, password TEXT NOT NULL, created_at TEXT NOT NULL"
+                    ") WITHOUT ROWID"
+                )
+                if ancien_fichier is not None and ancien_fichier.exists():
+                    self.connexion.executemany(
+                        "INSERT OR IGNORE INTO utilisateurs VALUES (?, ?, ?)",
+                        [(nom, u["password"], u.get("created_at", "")) for nom, u in _lire_json(ancien_fichier).items()]
+                    )
+                self.connexion.execute(f"PRAGMA user_version = {VERSION_SCHEMA}")
+            self.connexion.execute("COMMIT")
+        except Exception:
+            self.connexion.execute("ROLLBACK")
+            raise
+
+    def lire(self, username):
+        ligne = self.connexion.execute(
+            "SELECT password, created_at FROM utilisateurs WHERE username = ?", (username,)
+        ).fetchone()
+        return {"password": ligne[0], "created_at": ligne[1]} if ligne else None
+
+    def existe(self, username):
+        return self.connexion.execute(
+            "SELECT 1 FROM utilisateurs WHERE username = ?", (username,)
+        ).fetchone() is not None
+
+    def ajouter(self, username, donnees):
+        """Ajoute un utilisateur ; retourne False s'il existe déjà (y compris ajouté par une autre instance)"""
+        try:
+            self.connexion.execute(
+                "INSERT INTO utilisateurs VALUES (?, ?, ?)",
+                (username, donnees["password"], donnees["created_at"])
+            )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def ajouter_lot(self, utilisateurs):
+        """
+        Ajoute {nom: donnees} dans une seule transaction.
+        Retourne les noms déjà présents, qui ne sont pas ajoutés.
+        """
+        noms = list(utilisateurs)
+        # BEGIN IMMEDIATE prend le verrou d'écriture : aucun de ces noms ne peut apparaître entre-temps
+        self.connexion.execute("BEGIN IMMEDIATE")
+        try:
+            existants = set()
+            for debut in range(0, len(noms), TAILLE_LOT_SQL):
+                tranche = noms[debut:debut + TAILLE_LOT_SQL]
+                existants.update(nom for nom, in self.connexion.execute(
+                    f"SELECT username FROM utilisateurs WHERE username IN ({','.join('?' * len(tranche))})",
+                    tranche
+                ))
+            self.connexion.executemany(
+                "INSERT INTO utilisateurs VALUES (?, ?, ?)",
+                [(nom, d["password"], d["created_at"]) for nom, d in utilisateurs.items() if nom not in existants]
+            )
+            self.connexion.execute("COMMIT")
+        except Exception:
+            self.connexion.execute("ROLLBACK")
+            raise
+        return [nom for nom in noms if nom in existants]
+
+    def tous(self):
+        return {
+            nom: {"password": password, "created_at": created_at}
+            for nom, password, created_at in self.connexion.execute("SELECT * FROM utilisateurs ORDER BY username")
+        }
+
+    def fermer(self):
+        self.connexion.close()
+
+
+def _lire_json(chemin):
+    try:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return {}
+
+
+def stockage_par_defaut(dossier="data"):
+    """Base SQLite data/users.db, initialisée au premier démarrage depuis data/users.json"""
+    dossier = Path(dossier)
+    return StockageSQLite(dossier / "users.db", migrer_depuis=dossier / "users.json")
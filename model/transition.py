@@ -1,4 +1,6 @@
 class Transition:
+    __slots__ = ("source", "symbole", "destination")
+
     def __init__(self, source, symbole, destination):
         self.source = source
         self.symbole = symbole
@@ -1,37 +1,19 @@
-import json
-import os
 import re
-from pathlib import Path
 from datetime import datetime
 
-class UserManager:
-    def __init__(self):
-        self.users_file = Path("data/users.json")
-        self._ensure_data_directory()
-        self.load_users()
+from model.stockage_utilisateurs import stockage_par_defaut
 
-    def _ensure_data_directory(self):
-        self.users_file.parent.mkdir(parents=True, exist_ok=True)
-        if not self.users_file.exists():
-            self.users_file.write_text('{}')
+class UserManager:
+    def __init__(self, stockage=None):
+        """
+        stockage : StockageSQLite (par défaut, data/users.db) ou StockageJSON ; tout objet
+        offrant lire, existe, ajouter et ajouter_lot convient.
+        """
+        self.stockage = stockage if stockage is not None else stockage_par_defaut()
 
-    def load_users(self):
-        try:
-            with open(self.users_file, 'r') as f:
-                self.users = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            self.users = {}
-            self._save_users()
-
-    def _save_users(self):
-        """Sauvegarde les utilisateurs dans le fichier JSON"""
-        try:
-            with open(self.users_file, 'w') as f:
-                json.dump(self.users, f, indent=4)
-            print(f"Fichier users.json sauvegardé avec succès")
-        except Exception as e:
-            print(f"Erreur lors de la sauvegarde du fichier users.json: {str(e)}")
-            raise
+    @staticmethod
+    def _date_creation():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     def validate_password(self, password):
         """
@@ -60,15 +42,23 @@ class UserManager:
         Valide que le nom d'utilisateur respecte les critères.
         Retourne (bool, str) : (est_valide, message_erreur)
         """
+        format_valide, message = self._valider_format_username(username)
+        if not format_valide:
+            return False, message
+        
+        if self.stockage.existe(username):
+            return False, "Ce nom d'utilisateur existe déjà"
+        
+        return True, "Nom d'utilisateur valide"
+
+    @staticmethod
+    def _valider_format_username(username):
         if len(username) < 3:
             return False, "Le nom d'utilisateur doit contenir au moins 3 caractères"
         
         if not re.match(r"^[a-zA-Z0-9_]+$", username):
             return False, "Le nom d'utilisateur ne peut contenir que des lettres, chiffres et _"
         
-        if username in self.users:
-            return False, "Ce nom d'utilisateur existe déjà"
-        
         return True, "Nom d'utilisateur valide"
 
     def register_user(self, username, password):
@@ -77,9 +67,6 @@ class UserManager:
         Retourne (bool, str) : (succès, message)
         """
         try:
-            # Recharger les utilisateurs depuis le fichier pour avoir les données les plus récentes
-            self.load_users()
-            
             username_valid, username_msg = self.validate_username(username)
             if not username_valid:
                 return False, username_msg
@@ -88,38 +75,63 @@ class UserManager:
             if not password_valid:
                 return False, password_msg
             
-            self.users[username] = {
+            ajoute = self.stockage.ajouter(username, {
                 "password": password,
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            self._save_users()
-            
-            print(f"Utilisateur enregistré: {username}")
-            print(f"Contenu de users après enregistrement: {self.users}")
+                "created_at": self._date_creation()
+            })
+            if not ajoute:
+                # Inscrit entre-temps par une autre instance de l'application
+                return False, "Ce nom d'utilisateur existe déjà"
             
             return True, "Inscription réussie"
         except Exception as e:
             print(f"Erreur d'enregistrement: {str(e)}")
             return False, f"Erreur lors de l'inscription: {str(e)}"
 
+    def register_users_bulk(self, rows):
+        """
+        Enregistre un lot d'utilisateurs (paires username, password) en une seule écriture.
+        Toutes les lignes sont validées en mémoire ; les lignes invalides sont ignorées et
+        les autres enregistrées ensemble.
+        Retourne (nombre_inscrits, erreurs) où erreurs liste les (numéro de ligne à partir de 1,
+        username, message).
+        """
+        erreurs = []
+        valides = {}  # username -> (numéro de ligne, données)
+        date = self._date_creation()
+        for numero, (username, password) in enumerate(rows, start=1):
+            valide, message = self._valider_format_username(username)
+            if valide:
+                valide, message = self.validate_password(password)
+            if valide and username in valides:
+                valide, message = False, f"Nom d'utilisateur en double (ligne {valides[username][0]})"
+            if not valide:
+                erreurs.append((numero, username, message))
+                continue
+            valides[username] = (numero, {"password": password, "created_at": date})
+
+        if valides:
+            existants = self.stockage.ajouter_lot({nom: donnees for nom, (_, donnees) in valides.items()})
+            erreurs.extend((valides[nom][0], nom, "Ce nom d'utilisateur existe déjà") for nom in existants)
+            erreurs.sort()
+            return len(valides) - len(existants), erreurs
+        return 0, erreurs
+
     def authenticate_user(self, username, password):
         """
         Authentifie un utilisateur.
         Retourne (bool, str) : (succès, message)
         """
         try:
-            # Recharger les utilisateurs depuis le fichier pour avoir les données les plus récentes
-            self.load_users()
-            
-            if username not in self.users:
+            utilisateur = self.stockage.lire(username)
+            if utilisateur is None:
                 return False, "Nom d'utilisateur inconnu"
             
-            stored_password = self.users[username]["password"]
+            stored_password = utilisateur["password"]
             if password != stored_password:
                 return False, "Mot de passe incorrect"
             
             return True, "Authentification réussie"
         except Exception as e:
             print(f"Erreur d'authentification: {str(e)}")
-            print(f"Contenu de users: {self.users}")
             return False, f"Erreur lors de l'authentification: {str(e)}" 
\ No newline at end of file
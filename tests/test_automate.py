@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from model.automate import Automate, OperationAnnulee
+
+
+def _deux_initiaux():
+    """q0 et q1 initiaux et finaux, q1 -a-> q0 : « a » est accepté depuis q1 seulement"""
+    a = Automate("deux_initiaux")
+    a.ajouter_etat("q0", est_initial=True, est_final=True)
+    a.ajouter_etat("q1", est_initial=True, est_final=True)
+    a.ajouter_transition("q1", "a", "q0")
+    return a
+
+
+def test_reconnait_lot_plusieurs_etats_initiaux():
+    a = _deux_initiaux()
+    mots = ["", "a", "aa"]
+    assert [bool(r) for r in a.reconnait_lot(mots)] == [a.reconnait(mot) for mot in mots] == [True, True, False]
+
+
+def test_compile_refuse_plusieurs_etats_initiaux():
+    with pytest.raises(ValueError):
+        _deux_initiaux().compile()
+
+
+def test_iter_mots_acceptes_s_arrete_sans_mot_atteignable():
+    # L'état final q1 n'est pas atteignable depuis q0 : aucune longueur ne donne de mot
+    a = Automate("inatteignable")
+    a.ajouter_etat("q0", est_initial=True)
+    a.ajouter_etat("q1", est_final=True)
+    a.ajouter_transition("q0", "a", "q0")
+    a.ajouter_transition("q1", "b", "q1")
+    assert list(a.iter_mots_acceptes(10 ** 9)) == []
+
+
+def test_iter_mots_acceptes_annulable_a_chaque_longueur():
+    a = Automate("a_pairs")
+    a.ajouter_etat("q0", est_initial=True, est_final=True)
+    a.ajouter_transition("q0", "a", "q1")
+    a.ajouter_transition("q1", "a", "q0")
+    longueurs = []
+
+    def progression(fait, total):
+        longueurs.append(fait)
+        if len(longueurs) == 3:
+            raise OperationAnnulee()
+
+    with pytest.raises(OperationAnnulee):
+        list(a.iter_mots_acceptes(10 ** 9, progression=progression))
+
+
+def _afd_30_etats():
+    a = Automate("afd_30")
+    for i in range(30):
+        a.ajouter_etat(f"q{i}", est_initial=i == 0, est_final=i % 3 == 0)
+    for i in range(30):
+        a.ajouter_transition(f"q{i}", "a", f"q{(i + 1) % 30}")
+        a.ajouter_transition(f"q{i}", "b", f"q{(i * 7 + 2) % 30}")
+    return a
+
+
+def test_compter_mots_jusqua_annulable_par_exponentiation():
+    # n très grand devant l'automate : le dénombrement passe par l'exponentiation de matrice
+    debut = time.monotonic()
+
+    def progression(fait, total):
+        if time.monotonic() - debut > 0.2:
+            raise OperationAnnulee()
+
+    with pytest.raises(OperationAnnulee):
+        _afd_30_etats().compter_mots_jusqua(300000, progression)
+    assert time.monotonic() - debut < 5
+
+
+def test_format_binaire_sans_table_pour_plusieurs_etats_initiaux(tmp_path):
+    from model import format_binaire
+    chemin = str(tmp_path / "deux_initiaux.autb")
+    _deux_initiaux().save_binary(chemin)
+    with pytest.raises(ValueError):
+        format_binaire.charger_dfa_compile(chemin)
+    assert Automate.load_binary(chemin).reconnait("a")
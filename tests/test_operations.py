@@ -0,0 +1,37 @@
+import time
+
+from model.automate import Automate
+from Window.MotEtLanguages import MotEtLangages
+from Window.OperationWorker import TacheOperation
+
+
+def _afd_30_etats():
+    a = Automate("afd_30")
+    for i in range(30):
+        a.ajouter_etat(f"q{i}", est_initial=i == 0, est_final=i % 3 == 0)
+    for i in range(30):
+        a.ajouter_transition(f"q{i}", "a", f"q{(i + 1) % 30}")
+        a.ajouter_transition(f"q{i}", "b", f"q{(i * 7 + 2) % 30}")
+    return a
+
+
+def test_generation_des_mots_annulee_pendant_le_denombrement():
+    automate = _afd_30_etats()
+    tache = TacheOperation(lambda progression: MotEtLangages.calculer_mots_acceptes(automate, 300000, progression))
+    issues = []
+    tache.signaux.annulee.connect(lambda: issues.append("annulee"))
+    tache.signaux.termine.connect(lambda resultat: issues.append("termine"))
+    tache.signaux.echec.connect(lambda message: issues.append(message))
+
+    # « Annuler » est cliqué au moment où commence le dénombrement, après la liste des mots
+    compter = automate.compter_mots_jusqua
+
+    def compter_puis_annuler(n, progression=None):
+        tache.annulation.set()
+        return compter(n, progression)
+
+    automate.compter_mots_jusqua = compter_puis_annuler
+    debut = time.monotonic()
+    tache.run()
+    assert issues == ["annulee"]
+    assert time.monotonic() - debut < 5